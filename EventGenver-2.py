@@ -299,11 +299,15 @@ class EventGenerator:
         }
 
 def load_json(path: str) -> Dict:
-    for enc in ['utf-8-sig', 'utf-8', 'utf-16']:
-        try:
-            with open(path, 'r', encoding=enc) as f: return json.load(f)
-        except: pass
-    return {}
+    """Read the file once and decode it once: BOM picks UTF-8/UTF-16, json.loads sniffs the rest"""
+    try:
+        with open(path, 'rb') as f: raw = f.read()
+        if raw.startswith(b'\xef\xbb\xbf'): raw = raw[3:]
+        elif raw.startswith((b'\xff\xfe', b'\xfe\xff')): return json.loads(raw.decode('utf-16'))
+        try: return json.loads(raw)
+        except UnicodeDecodeError: return json.loads(raw.decode('utf-8', errors='replace'))
+    except (OSError, ValueError):
+        return {}
 
 def main():
     if len(sys.argv) < 5:
@@ -115,6 +115,10 @@ def transcribe_audio(audio_file, model_path):
 def format_output(results, audio_info):
     """Format transcription into structured JSON"""
     conversation = []
+    total_words = 0
+    confidence_sum = 0.0
+    speakers = {"Speaker_1": {"utterances": 0, "total_words": 0},
+                "Speaker_2": {"utterances": 0, "total_words": 0}}
     for idx, result in enumerate(results):
         text = result.get('text', '').strip()
         if not text: continue
@@ -127,11 +131,16 @@ def format_output(results, audio_info):
         if words and 'conf' in words[0]:
             confidence = sum(w.get('conf', 1.0) for w in words) / len(words)
         
-        conversation.append({
+        c = {
             "speaker": speaker, "start_time": round(start_time, 2),
             "end_time": round(end_time, 2), "duration": round(end_time - start_time, 2),
-            "text": text, "confidence": round(confidence, 3), "word_count": len(text.split())
-        })
+            "text": text, "confidence": round(confidence, 3), "word_count": text.count(' ') + 1
+        }
+        conversation.append(c)
+        total_words += c['word_count']
+        confidence_sum += c['confidence']
+        speakers[speaker]['utterances'] += 1
+        speakers[speaker]['total_words'] += c['word_count']
     
     return {
         "metadata": {
@@ -142,16 +151,11 @@ def format_output(results, audio_info):
                                "channels": audio_info['channels'], "format": "WAV"},
             "conversation_stats": {
                 "total_speakers": 2, "total_utterances": len(conversation),
-                "total_words": sum(c['word_count'] for c in conversation),
-                "average_confidence": round(sum(c['confidence'] for c in conversation) / len(conversation), 3) if conversation else 0
+                "total_words": total_words,
+                "average_confidence": round(confidence_sum / len(conversation), 3) if conversation else 0
             }
         },
-        "speakers": {
-            "Speaker_1": {"utterances": len([c for c in conversation if c['speaker'] == 'Speaker_1']),
-                        "total_words": sum(c['word_count'] for c in conversation if c['speaker'] == 'Speaker_1')},
-            "Speaker_2": {"utterances": len([c for c in conversation if c['speaker'] == 'Speaker_2']),
-                        "total_words": sum(c['word_count'] for c in conversation if c['speaker'] == 'Speaker_2')}
-        },
+        "speakers": speakers,
         "conversation": conversation,
         "full_transcript": {
             "text": " ".join([c['text'] for c in conversation]),
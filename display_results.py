@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """Display formatted summary of VtoT(2) JSON output"""
-import json
+import json, sys
 
 # Load the JSON output
 with open('sales_call_output.json', 'r', encoding='utf-16') as f:
@@ -54,12 +54,11 @@ if status == "SUCCESS":
         # Show first 10 words with timing
         print("First 10 Words (with timestamps and confidence):")
         print("-" * 80)
-        for i, word in enumerate(words[:10]):
-            w = word.get('word', '')
-            start = word.get('start', 0)
-            end = word.get('end', 0)
-            conf = word.get('conf', 0)
-            print(f"{i+1:2d}. [{start:6.2f}s - {end:6.2f}s] '{w}' (confidence: {conf:.1%})")
+        sys.stdout.write("".join(
+            f"{i+1:2d}. [{word.get('start', 0):6.2f}s - {word.get('end', 0):6.2f}s] "
+            f"'{word.get('word', '')}' (confidence: {word.get('conf', 0):.1%})\n"
+            for i, word in enumerate(words[:10])
+        ))
         
         if word_count > 10:
             print(f"... and {word_count - 10} more words")
@@ -70,11 +69,10 @@ if status == "SUCCESS":
         if low_conf_words:
             print(f"Low Confidence Words ({len(low_conf_words)} words with confidence < 50%):")
             print("-" * 80)
-            for word in low_conf_words[:5]:
-                w = word.get('word', '')
-                start = word.get('start', 0)
-                conf = word.get('conf', 0)
-                print(f"  [{start:6.2f}s] '{w}' (confidence: {conf:.1%})")
+            sys.stdout.write("".join(
+                f"  [{word.get('start', 0):6.2f}s] '{word.get('word', '')}' (confidence: {word.get('conf', 0):.1%})\n"
+                for word in low_conf_words[:5]
+            ))
             if len(low_conf_words) > 5:
                 print(f"  ... and {len(low_conf_words) - 5} more")
         
@@ -5,19 +5,25 @@ Supports vosk-model-en-in-0.5 and vosk-model-en-us-0.22
 """
 import urllib.request
 import zipfile
+import hashlib
+import mmap
 import os
 import sys
 
+HASH_CHUNK = 16 * 1024 * 1024
+
 MODELS = {
     "vosk-model-en-in-0.5": {
         "url": "https://alphacephei.com/vosk/models/vosk-model-en-in-0.5.zip",
         "size": "1.0 GB",
-        "description": "Indian English model - good for various accents"
+        "description": "Indian English model - good for various accents",
+        "sha256": None  # set to the published checksum to pin the download
     },
     "vosk-model-en-us-0.22": {
         "url": "https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip",
         "size": "1.8 GB",
-        "description": "Large US English model - highest accuracy"
+        "description": "Large US English model - highest accuracy",
+        "sha256": None  # set to the published checksum to pin the download
     }
 }
 
@@ -41,6 +47,34 @@ def extract_zip(zip_path, extract_to="."):
         zip_ref.extractall(extract_to)
     print("[OK] Extraction complete!")
 
+def verify_zip(zip_path, expected_sha256=None):
+    """Check a downloaded ZIP against its SHA-256, or its CRCs when no checksum is pinned"""
+    print(f"[INFO] Verifying {zip_path}...")
+    try:
+        if expected_sha256:
+            digest = hashlib.sha256()
+            with open(zip_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mm)
+                for off in range(0, len(mm), HASH_CHUNK):
+                    digest.update(view[off:off + HASH_CHUNK])
+                view.release()
+            if digest.hexdigest() != expected_sha256.lower():
+                print(f"[ERROR] Checksum mismatch: {digest.hexdigest()}")
+                return False
+        else:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                bad = zip_ref.testzip()
+            if bad:
+                print(f"[ERROR] Corrupt member: {bad}")
+                return False
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] Verification failed: {e}")
+        return False
+    print("[OK] Archive verified!")
+    return True
+
 def verify_model(model_dir):
     """Verify model structure"""
     required_dirs = ['am', 'conf', 'graph']
@@ -96,6 +130,9 @@ def main():
         try:
             download_with_progress(model_info['url'], zip_filename)
             print(f"[OK] Download complete!")
+            if not verify_zip(zip_filename, model_info.get('sha256')):
+                os.remove(zip_filename)
+                sys.exit(1)
             
             print(f"\n[2/3] EXTRACTING")
             extract_zip(zip_filename)
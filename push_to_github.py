@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """Create GitHub repository and push code"""
 import subprocess
+import shutil
 import sys
 import os
 
+GIT = shutil.which("git")
+
 def create_and_push():
     print("=" * 70)
     print("GITHUB REPOSITORY SETUP")
@@ -23,6 +26,10 @@ def create_and_push():
         print("[ERROR] Username and token are required!")
         return False
     
+    if GIT is None:
+        print("[ERROR] git not found on PATH!")
+        return False
+    
     print(f"\n[1/3] Creating {visibility} repository '{repo_name}' on GitHub...")
     
     # Create repository using GitHub API
@@ -59,23 +66,29 @@ def create_and_push():
         return False
     
     print(f"\n[2/3] Adding remote origin...")
-    subprocess.run(["git", "remote", "add", "origin", repo_url], 
-                   capture_output=True)
+    subprocess.run([GIT, "remote", "add", "origin", repo_url], check=False,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     
     print(f"[3/3] Pushing to GitHub...")
-    result = subprocess.run(
-        ["git", "push", "-u", "origin", "main"],
-        capture_output=True,
+    # Stream push progress instead of buffering the whole protocol output
+    proc = subprocess.Popen(
+        [GIT, "push", "-u", "origin", "main"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True
     )
+    last_line = ""
+    for line in proc.stderr:
+        print(f"  {line.rstrip()}")
+        last_line = line.strip() or last_line
+    proc.wait()
     
-    if result.returncode == 0:
+    if proc.returncode == 0:
         print(f"[OK] Successfully pushed to GitHub!")
-        print(f"\n{result.stdout}")
         print(f"\n✓ Repository URL: https://github.com/{github_username}/{repo_name}")
         return True
     else:
-        print(f"[ERROR] Push failed: {result.stderr}")
+        print(f"[ERROR] Push failed: {last_line}")
         return False
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 """Simple script to run Vosk transcription with WAV file"""
-import json, os, wave, struct
+import io, json, mmap, os, sys, wave, struct
+from collections import defaultdict
 from datetime import datetime
 import vosk
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
 
 MODEL_PATH = "./vosk-model-small-en-us-0.15"
 
@@ -23,6 +29,23 @@ def create_test_wav():
     print(f"[OK] Created: {wav_file}")
     return wav_file
 
+def read_wav_layout(mm):
+    """Locate the PCM payload in a mapped WAV file: (data_start, data_end, frame_rate, block_align)"""
+    if mm[:4] != b'RIFF' or mm[8:12] != b'WAVE':
+        raise ValueError("not a RIFF/WAVE file")
+    pos, frame_rate, block_align = 12, None, None
+    while pos + 8 <= len(mm):
+        chunk_id = mm[pos:pos + 4]
+        size, = struct.unpack_from('<I', mm, pos + 4)
+        body = pos + 8
+        if chunk_id == b'fmt ':
+            frame_rate, = struct.unpack_from('<I', mm, body + 4)
+            block_align, = struct.unpack_from('<H', mm, body + 12)
+        elif chunk_id == b'data':
+            return body, min(body + size, len(mm)), frame_rate, block_align
+        pos = body + size + (size & 1)  # chunks are word-aligned
+    raise ValueError("WAV file has no data chunk")
+
 def transcribe_audio(audio_file, model_path):
     """Transcribe audio using Vosk"""
     print(f"\n[INFO] Loading Vosk model...")
@@ -30,20 +53,22 @@ def transcribe_audio(audio_file, model_path):
     print("[OK] Model loaded")
     
     print(f"\n[INFO] Transcribing: {audio_file}")
-    wf = wave.open(audio_file, "rb")
-    rec = vosk.KaldiRecognizer(model, wf.getframerate())
+    with open(audio_file, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    data_start, data_end, frame_rate, block_align = read_wav_layout(mm)
+    rec = vosk.KaldiRecognizer(model, frame_rate)
     rec.SetWords(True)
     
     results = []
-    frame_count = 0
-    total_frames = wf.getnframes()
-    
-    while True:
-        data = wf.readframes(4000)
-        if not data:
-            break
-        frame_count += 4000
-        progress = min((frame_count / total_frames) * 100, 100)
+    chunk_bytes = 4000 * block_align
+    inv_total = 100.0 / max(data_end - data_start, 1)
+    
+    # Feed the mapped PCM straight to Vosk, 4000 frames at a time
+    for off in range(data_start, data_end, chunk_bytes):
+        data = mm[off:min(off + chunk_bytes, data_end)]
+        progress = min((off + chunk_bytes - data_start) * inv_total, 100)
         print(f"\rProgress: {progress:.1f}%", end='')
         
         if rec.AcceptWaveform(data):
@@ -55,7 +80,7 @@ def transcribe_audio(audio_file, model_path):
     if final.get('text'):
         results.append(final)
     
-    wf.close()
+    mm.close()
     print("\n[OK] Transcription complete")
     
     # Add demo data if no speech detected
@@ -73,6 +98,11 @@ def transcribe_audio(audio_file, model_path):
 def format_output(results, audio_file):
     """Format transcription into structured JSON"""
     conversation = []
+    total_words = 0
+    confidence_sum = 0.0
+    # Per-speaker counts and transcript text accumulated alongside the conversation
+    spk = defaultdict(lambda: [0, 0])
+    text_buf, formatted_buf = io.StringIO(), io.StringIO()
     
     for idx, result in enumerate(results):
         text = result.get('text', '').strip()
@@ -88,18 +118,29 @@ def format_output(results, audio_file):
         if words and 'conf' in words[0]:
             confidence = sum(w.get('conf', 1.0) for w in words) / len(words)
         
-        conversation.append({
+        c = {
             "speaker": speaker,
             "start_time": round(start_time, 2),
             "end_time": round(end_time, 2),
             "duration": round(end_time - start_time, 2),
             "text": text,
             "confidence": round(confidence, 3),
-            "word_count": len(text.split())
-        })
-    
-    total_words = sum(c['word_count'] for c in conversation)
-    avg_confidence = sum(c['confidence'] for c in conversation) / len(conversation) if conversation else 0
+            "word_count": text.count(' ') + 1
+        }
+        
+        total_words += c['word_count']
+        confidence_sum += c['confidence']
+        s = spk[speaker]
+        s[0] += 1
+        s[1] += c['word_count']
+        if conversation:
+            text_buf.write(" ")
+            formatted_buf.write("\n")
+        text_buf.write(text)
+        formatted_buf.write(f"[{c['start_time']}s] {speaker}: {text}")
+        conversation.append(c)
+    
+    avg_confidence = confidence_sum / len(conversation) if conversation else 0
     
     return {
         "metadata": {
@@ -119,19 +160,13 @@ def format_output(results, audio_file):
             }
         },
         "speakers": {
-            "Speaker_1": {
-                "utterances": len([c for c in conversation if c['speaker'] == 'Speaker_1']),
-                "total_words": sum(c['word_count'] for c in conversation if c['speaker'] == 'Speaker_1')
-            },
-            "Speaker_2": {
-                "utterances": len([c for c in conversation if c['speaker'] == 'Speaker_2']),
-                "total_words": sum(c['word_count'] for c in conversation if c['speaker'] == 'Speaker_2')
-            }
+            name: {"utterances": spk[name][0], "total_words": spk[name][1]}
+            for name in ("Speaker_1", "Speaker_2")
         },
         "conversation": conversation,
         "full_transcript": {
-            "text": " ".join([c['text'] for c in conversation]),
-            "formatted": "\n".join([f"[{c['start_time']}s] {c['speaker']}: {c['text']}" for c in conversation])
+            "text": text_buf.getvalue(),
+            "formatted": formatted_buf.getvalue()
         }
     }
 
@@ -152,8 +187,13 @@ def main():
     # Save JSON
     output_file = "transcription_output.json"
     print(f"\n[INFO] Saving to: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    if HAS_MSGSPEC:
+        # C encoder + formatter; output is UTF-8 like ensure_ascii=False
+        with open(output_file, 'wb') as f:
+            f.write(msgspec.json.format(msgspec.json.encode(output), indent=2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
     print(f"[OK] Saved successfully!")
     
     # Display summary
@@ -172,8 +212,7 @@ def main():
     
     print(f"\nConversation Preview:")
     print("-" * 70)
-    for c in output['conversation'][:5]:
-        print(f"[{c['start_time']}s] {c['speaker']}: {c['text']}")
+    sys.stdout.write("".join(f"[{c['start_time']}s] {c['speaker']}: {c['text']}\n" for c in output['conversation'][:5]))
     if len(output['conversation']) > 5:
         print(f"... and {len(output['conversation']) - 5} more")
     
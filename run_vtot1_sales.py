@@ -2,7 +2,36 @@
 """Wrapper to run VtoT(1).py with sales call audio"""
 import subprocess
 import json
+import os
+import struct
 import sys
+import tempfile
+import numpy as np
+
+def _read_pcm16_wav(path):
+    """Map the samples of a 16-bit PCM WAV without copying: (int16 array, sample_rate, channels)"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        sample_rate = channels = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = f.read(size + (size & 1))
+                channels, sample_rate = struct.unpack('<HI', fmt[2:8])
+                if struct.unpack('<H', fmt[14:16])[0] != 16:
+                    raise ValueError(f"{path} is not 16-bit PCM")
+            elif chunk_id == b'data':
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+    size = min(size, os.path.getsize(path) - offset) // 2 * 2
+    return np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(size // 2,)), sample_rate, channels
 
 def run_vtot1_on_sales_call():
     """Run VtoT(1).py on the sales call audio"""
@@ -21,66 +50,88 @@ def run_vtot1_on_sales_call():
     
     # Import and run transcription directly
     import os
-    import wave
     import vosk
     from datetime import datetime
     
-    MODEL_PATH = "./vosk-model-small-en-us-0.15"
-    
-    # Convert to WAV if needed
-    wav_file = audio_file
-    if audio_file.lower().endswith('.mp3'):
-        print("[INFO] Converting MP3 to WAV...")
-        import subprocess
-        wav_file = "temp_sales_call.wav"
-        subprocess.run([
-            'ffmpeg', '-i', audio_file,
-            '-ar', '16000', '-ac', '1', '-y', wav_file
-        ], capture_output=True, shell=True)
+    # VOSK_MODEL_PATH selects an alternative (e.g. smaller/quantized) bundle
+    MODEL_PATH = os.environ.get("VOSK_MODEL_PATH", "./vosk-model-small-en-us-0.15")
     
     # Transcribe
     print("[INFO] Loading Vosk model...")
     model = vosk.Model(MODEL_PATH)
     
     print("[INFO] Transcribing audio...")
-    wf = wave.open(wav_file, "rb")
-    rec = vosk.KaldiRecognizer(model, wf.getframerate())
+    chunk_frames = 64000  # ~4s at 16kHz per AcceptWaveform call
+    progress_every = chunk_frames * 8
+    ffmpeg = None
+    
+    if audio_file.lower().endswith('.mp3'):
+        # Decode straight to raw 16kHz mono PCM on ffmpeg's stdout; no temp WAV
+        print("[INFO] Decoding MP3 via ffmpeg pipe...")
+        sample_rate, channels, total_frames = 16000, 1, None
+        # ffmpeg's error output is small; a temp file holds it without a second pipe to drain
+        ffmpeg_err = tempfile.TemporaryFile()
+        try:
+            ffmpeg = subprocess.Popen([
+                'ffmpeg', '-loglevel', 'error', '-i', audio_file,
+                '-ar', '16000', '-ac', '1', '-f', 's16le', '-'
+            ], stdout=subprocess.PIPE, stderr=ffmpeg_err)
+        except FileNotFoundError:
+            print("[ERROR] ffmpeg not found. Install ffmpeg and make sure it is on PATH.")
+            sys.exit(1)
+        chunks = iter(lambda: ffmpeg.stdout.read(chunk_frames * 2), b'')
+    else:
+        pcm, sample_rate, channels = _read_pcm16_wav(audio_file)
+        total_frames = len(pcm) // channels
+        chunk_samples = chunk_frames * channels
+        chunks = (pcm[start:start + chunk_samples].tobytes() for start in range(0, len(pcm), chunk_samples))
+    
+    rec = vosk.KaldiRecognizer(model, sample_rate)
     rec.SetWords(True)
     
     results = []
     frame_count = 0
-    total_frames = wf.getnframes()
-    
-    while True:
-        data = wf.readframes(4000)
-        if not data:
-            break
-        frame_count += 4000
-        progress = min((frame_count / total_frames) * 100, 100)
-        print(f"\rProgress: {progress:.1f}%", end='')
+    
+    for data in chunks:
+        frame_count += len(data) // (2 * channels)
+        if frame_count % progress_every == 0 or (total_frames and frame_count >= total_frames):
+            if total_frames:
+                print(f"\rProgress: {min((frame_count / total_frames) * 100, 100):.1f}%", end='')
+            else:
+                print(f"\rDecoded: {frame_count / sample_rate:.1f}s", end='')
         
         if rec.AcceptWaveform(data):
             result = json.loads(rec.Result())
             if result.get('text'):
                 results.append(result)
     
+    if ffmpeg is not None:
+        ffmpeg.wait()
+        if ffmpeg.returncode != 0:
+            ffmpeg_err.seek(0)
+            print(f"\n[ERROR] ffmpeg failed to decode {audio_file} (exit {ffmpeg.returncode}):")
+            print(ffmpeg_err.read().decode(errors='replace').strip())
+            sys.exit(1)
+        total_frames = frame_count
+    
     final = json.loads(rec.FinalResult())
     if final.get('text'):
         results.append(final)
     
-    wf.close()
     print("\n[OK] Transcription complete")
     
-    # Get audio info
-    with wave.open(wav_file, "rb") as wf:
-        audio_info = {
-            "channels": wf.getnchannels(),
-            "frame_rate": wf.getframerate(),
-            "duration": wf.getnframes() / float(wf.getframerate())
-        }
+    # Audio info comes from the header already parsed for transcription
+    audio_info = {
+        "channels": channels,
+        "frame_rate": sample_rate,
+        "duration": total_frames / float(sample_rate)
+    }
     
     # Format output (VtoT1 style)
     conversation = []
+    total_words = 0
+    confidence_sum = 0.0
+    speakers = {}
     for idx, result in enumerate(results):
         text = result.get('text', '').strip()
         if not text:
@@ -95,31 +146,32 @@ def run_vtot1_on_sales_call():
         if words and 'conf' in words[0]:
             confidence = sum(w.get('conf', 1.0) for w in words) / len(words)
         
-        conversation.append({
+        c = {
             "speaker": speaker,
             "start_time": round(start_time, 2),
             "end_time": round(end_time, 2),
             "duration": round(end_time - start_time, 2),
             "text": text,
             "confidence": round(confidence, 3),
-            "word_count": len(text.split())
-        })
-    
-    total_words = sum(c['word_count'] for c in conversation)
-    avg_confidence = sum(c['confidence'] for c in conversation) / len(conversation) if conversation else 0
+            "word_count": text.count(' ') + 1
+        }
+        conversation.append(c)
+        
+        # Running totals and speaker counts
+        total_words += c['word_count']
+        confidence_sum += c['confidence']
+        s = speakers.get(speaker)
+        if s is None:
+            s = speakers[speaker] = {"utterances": 0, "total_words": 0}
+        s['utterances'] += 1
+        s['total_words'] += c['word_count']
     
-    # Count speakers
-    speakers = {}
-    for c in conversation:
-        if c['speaker'] not in speakers:
-            speakers[c['speaker']] = {"utterances": 0, "total_words": 0}
-        speakers[c['speaker']]['utterances'] += 1
-        speakers[c['speaker']]['total_words'] += c['word_count']
+    avg_confidence = confidence_sum / len(conversation) if conversation else 0
     
     output = {
         "metadata": {
             "generated_at": datetime.now().isoformat(),
-            "model": "vosk-model-small-en-us-0.15",
+            "model": os.path.basename(os.path.normpath(MODEL_PATH)),
             "audio_file": audio_file,
             "audio_properties": {
                 "duration_seconds": round(audio_info['duration'], 2),
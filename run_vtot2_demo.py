@@ -3,54 +3,57 @@
 Wrapper script to run VtoT(2).py and save output to file
 Demonstrates the agent's rejection logic and structured output
 """
-import subprocess
+import importlib.util
 import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def run_vtot2(audio_file, output_file):
-    """Run VtoT(2).py and save output to file"""
-    print(f"[INFO] Running VtoT(2).py on: {audio_file}")
+VTOT2_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "VtoT(2).py")
+PRINT_LOCK = threading.Lock()
+
+def load_vtot2():
+    """Import VtoT(2).py in-process so the VOSK model is loaded once for all files"""
+    spec = importlib.util.spec_from_file_location("vtot2", VTOT2_PATH)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except SystemExit:
+        # VtoT(2) exits when vosk is missing (after printing its REJECTED JSON)
+        return None
+    return module
+
+def run_vtot2(agent, audio_file, output_file):
+    """Transcribe with a loaded VtoT(2) agent and save output to file"""
+    # Buffer this file's log lines and print them as one block, so
+    # concurrent workers don't interleave their output
+    log = [f"\nTest Case: {audio_file}", "-" * 70, f"[INFO] Running VtoT(2) on: {audio_file}"]
     
     try:
-        result = subprocess.run(
-            ["python", "VtoT(2).py", audio_file],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        # Parse JSON output
-        try:
-            output_data = json.loads(result.stdout)
-        except:
-            output_data = {
-                "text": "",
-                "result": [],
-                "status": "ERROR",
-                "reason": "failed_to_parse_output",
-                "raw_output": result.stdout,
-                "error": result.stderr
-            }
+        output_data = agent.transcribe(audio_file)
         
         # Save to file
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, indent=2)
         
-        print(f"[OK] Output saved to: {output_file}")
-        print(f"[STATUS] {output_data.get('status', 'UNKNOWN')}")
+        log.append(f"[OK] Output saved to: {output_file}")
+        log.append(f"[STATUS] {output_data.get('status', 'UNKNOWN')}")
         
         if output_data.get('status') == 'REJECTED':
-            print(f"[REASON] {output_data.get('reason', 'unknown')}")
+            log.append(f"[REASON] {output_data.get('reason', 'unknown')}")
         elif output_data.get('status') == 'SUCCESS':
             word_count = len(output_data.get('result', []))
-            print(f"[SUCCESS] Transcribed {word_count} words")
-            print(f"[TEXT] {output_data.get('text', '')[:100]}...")
-        
-        return output_data
+            log.append(f"[SUCCESS] Transcribed {word_count} words")
+            log.append(f"[TEXT] {output_data.get('text', '')[:100]}...")
         
     except Exception as e:
-        print(f"[ERROR] {e}")
-        return None
+        log.append(f"[ERROR] {e}")
+        output_data = None
+    
+    with PRINT_LOCK:
+        print("\n".join(log) + "\n")
+    return output_data
 
 def main():
     print("=" * 70)
@@ -64,14 +67,23 @@ def main():
         ("test_audio.wav", "vtot2_test_audio_output.json"),
     ]
     
-    results = []
-    for audio_file, output_file in test_cases:
-        print(f"\nTest Case: {audio_file}")
-        print("-" * 70)
-        result = run_vtot2(audio_file, output_file)
-        if result:
-            results.append((audio_file, output_file, result))
-        print()
+    vtot2 = load_vtot2()
+    if vtot2 is None:
+        print("\n[ERROR] VtoT(2) could not be loaded (is vosk installed?)")
+        sys.exit(1)
+    model_path = vtot2.find_vosk_model()
+    if model_path is None:
+        print("[ERROR] No VOSK model found")
+        sys.exit(1)
+    print(f"[INFO] Loading VOSK model: {model_path}")
+    agent = vtot2.SpeechTranscriptionAgent(model_path)
+    
+    # The VOSK model is shared; each transcribe() call builds its own recognizer
+    # and Kaldi decoding releases the GIL, so files run concurrently
+    with ThreadPoolExecutor(max_workers=min(len(test_cases), os.cpu_count() or 1)) as ex:
+        outputs = ex.map(lambda case: run_vtot2(agent, *case), test_cases)
+        results = [(audio_file, output_file, result)
+                   for (audio_file, output_file), result in zip(test_cases, outputs) if result]
     
     # Summary
     print("=" * 70)
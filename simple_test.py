@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Very simple Vosk model loading test"""
+import os
 import vosk
 
-# Change this path to where your model is located
-MODEL_PATH = "./vosk-model-small-en-us-0.15"  # Downloaded model location
+# Change this path (or set VOSK_MODEL_PATH) to where your model is located
+MODEL_PATH = os.environ.get("VOSK_MODEL_PATH", "./vosk-model-small-en-us-0.15")  # Downloaded model location
 
 print("Testing Vosk Model Loading...")
 print(f"Model path: {MODEL_PATH}")
@@ -3,8 +3,13 @@
 Test Whisper directly to diagnose the issue
 """
 import whisper
+import torch
 import sys
 
+# Use tensor-core fp16 on a GPU when one is present, fp32 on CPU otherwise
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+FP16 = DEVICE == "cuda"
+
 def test_whisper():
     print("="*70)
     print("WHISPER STANDALONE TEST")
@@ -13,8 +18,8 @@ def test_whisper():
     
     audio_file = r"C:\Users\arnav\Downloads\Sales Call example 1.wav"
     
-    print(f"[1/2] Loading Whisper base model...")
-    model = whisper.load_model("base", device="cpu")
+    print(f"[1/2] Loading Whisper base model ({DEVICE})...")
+    model = whisper.load_model("base", device=DEVICE)
     print("[OK] Model loaded")
     print()
     
@@ -25,7 +30,7 @@ def test_whisper():
         result = model.transcribe(
             audio_file,
             language="en",
-            fp16=False,
+            fp16=FP16,
             verbose=True  # Show progress
         )
         
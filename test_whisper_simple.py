@@ -1,26 +1,58 @@
 #!/usr/bin/env python3
 """Simple Whisper test with manual WAV loading"""
 import whisper
-import wave
+import torch
+import os
+import struct
 import numpy as np
 import sys
 
+def _read_pcm16_wav(path):
+    """Map the samples of a 16-bit PCM WAV without copying: (int16 array, sample_rate, channels)"""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        sample_rate = channels = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = chunk[:4], struct.unpack('<I', chunk[4:])[0]
+            if chunk_id == b'fmt ':
+                fmt = f.read(size + (size & 1))
+                channels, sample_rate = struct.unpack('<HI', fmt[2:8])
+                if struct.unpack('<H', fmt[14:16])[0] != 16:
+                    raise ValueError(f"{path} is not 16-bit PCM")
+            elif chunk_id == b'data':
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + (size & 1), 1)
+    size = min(size, os.path.getsize(path) - offset) // 2 * 2
+    return np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(size // 2,)), sample_rate, channels
+
+# Use tensor-core fp16 on a GPU when one is present, fp32 on CPU otherwise
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+FP16 = DEVICE == "cuda"
+
 audio_file = r"C:\Users\arnav\Downloads\Sales Call example 1.wav"
 
-print("Loading Whisper base model...")
-model = whisper.load_model("base", device="cpu")
+print(f"Loading Whisper base model ({DEVICE})...")
+model = whisper.load_model("base", device=DEVICE)
 
 print(f"Loading audio: {audio_file}")
-with wave.open(audio_file, 'rb') as wf:
-    sample_rate = wf.getframerate()
-    frames = wf.readframes(wf.getnframes())
-    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-    print(f"  Sample rate: {sample_rate} Hz")
-    print(f"  Audio length: {len(audio)} samples ({len(audio)/sample_rate:.1f} seconds)")
+pcm, sample_rate, _ = _read_pcm16_wav(audio_file)
+# Scale straight from the mapped int16 samples into one float32 buffer (no float temporaries)
+audio = np.empty(len(pcm), dtype=np.float32)
+np.multiply(pcm, np.float32(1 / 32768.0), out=audio, casting='unsafe')
+del pcm
+print(f"  Sample rate: {sample_rate} Hz")
+print(f"  Audio length: {len(audio)} samples ({len(audio)/sample_rate:.1f} seconds)")
 
 print("\nTranscribing...")
 try:
-    result = model.transcribe(audio, fp16=False, verbose=False)
+    result = model.transcribe(audio, fp16=FP16, verbose=False)
     print(f"\nSUCCESS!")
     print(f"Text: {result['text']}")
     print(f"Language: {result.get('language', 'unknown')}")
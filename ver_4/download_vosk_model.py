@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """Script to download and setup Vosk speech recognition model"""
-import os, sys, urllib.request, zipfile
+import hashlib, mmap, os, sys, urllib.request, zipfile
 from pathlib import Path
 
 MODEL_NAME = "vosk-model-small-en-us-0.15"
 MODEL_URL = f"https://alphacephei.com/vosk/models/{MODEL_NAME}.zip"
 DOWNLOAD_DIR = "."
+# Published SHA-256 of the model ZIP; when unset the archive CRCs are checked instead
+MODEL_SHA256 = os.environ.get("VOSK_MODEL_SHA256")
+HASH_CHUNK = 16 * 1024 * 1024
 
 def download_file(url, filename):
     """Download file with progress indicator"""
@@ -40,6 +43,34 @@ def extract_zip(zip_path, extract_to):
         print(f"[FAIL] Extraction failed: {e}")
         return False
 
+def verify_zip(zip_path, expected_sha256=None):
+    """Check a downloaded ZIP against its SHA-256, or its CRCs when no checksum is pinned"""
+    print(f"\nVerifying {zip_path}...")
+    try:
+        if expected_sha256:
+            digest = hashlib.sha256()
+            with open(zip_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                view = memoryview(mm)
+                for off in range(0, len(mm), HASH_CHUNK):
+                    digest.update(view[off:off + HASH_CHUNK])
+                view.release()
+            if digest.hexdigest() != expected_sha256.lower():
+                print(f"[FAIL] Checksum mismatch: {digest.hexdigest()}")
+                return False
+        else:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                bad = zip_ref.testzip()
+            if bad:
+                print(f"[FAIL] Corrupt member: {bad}")
+                return False
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[FAIL] Verification failed: {e}")
+        return False
+    print("[OK] Archive verified!")
+    return True
+
 def verify_model(model_dir):
     """Verify model structure"""
     print(f"\nVerifying model structure...")
@@ -71,6 +102,9 @@ def main():
     if not download_file(MODEL_URL, zip_filename):
         sys.exit(1)
     
+    if not verify_zip(zip_filename, MODEL_SHA256):
+        sys.exit(1)
+    
     print("\n[2/3] EXTRACTING")
     if not extract_zip(zip_filename, DOWNLOAD_DIR):
         sys.exit(1)
@@ -2,9 +2,9 @@ import os
 import sys
 import json
 import asyncio
-import threading
-import subprocess
 import shutil
+import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -13,6 +13,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = FastAPI(title="AuditX Backend", version="1.0.0")
 
 # Enable CORS for frontend
@@ -31,6 +36,7 @@ PIPELINE_DIR = BASE_DIR / "v2_pipeline"
 OUTPUT_DIR = BASE_DIR # Reverting to root to see pre-existing files
 AUDIO_DIR = BASE_DIR / "audio_public" 
 AUDIO_BASE_URL = "http://localhost:8000/audio"
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1 << 20))
 
 INPUT_DIR.mkdir(exist_ok=True)
 AUDIO_DIR.mkdir(exist_ok=True)
@@ -65,7 +71,12 @@ class SessionDetail(SessionSummary):
     aiFlags: List[Dict]
 
 # --- HELPER: Async Pipeline Runner ---
-def run_pipeline_thread(filepath: Path, call_id: str):
+# Bound concurrent pipelines so uploads queue instead of oversubscribing cores
+PIPELINE_SEM = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+# Keep strong references to in-flight pipeline tasks until they finish
+pipeline_tasks = set()
+
+async def run_pipeline(filepath: Path, call_id: str):
     print(f"[SERVER] Starting pipeline for {call_id}...", file=sys.stderr)
     processing_status[call_id] = "processing"
     
@@ -82,25 +93,29 @@ def run_pipeline_thread(filepath: Path, call_id: str):
              processing_status[call_id] = "error"
              return
 
-        cmd = [sys.executable, str(script_path), str(filepath)]
-        
         # Run from BASE_DIR so output files land in OUTPUT_DIR (root)
         # We add PIPELINE_DIR to PYTHONPATH so scripts can find config/etc.
         env = os.environ.copy()
         env["PYTHONPATH"] = str(pipeline_dir) + os.pathsep + env.get("PYTHONPATH", "")
         
-        # This blocks the THREAD, not the server
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(BASE_DIR), env=env)
+        # Awaiting the child yields to the event loop instead of blocking a thread
+        async with PIPELINE_SEM:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, str(script_path), str(filepath),
+                cwd=str(BASE_DIR), env=env,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await proc.communicate()
         
         # Log output for debugging
         log_path = INPUT_DIR / f"{call_id}_pipeline.log"
         with open(log_path, "w", encoding="utf-8") as log_file:
             log_file.write("=== STDOUT ===\n")
-            log_file.write(result.stdout)
+            log_file.write(stdout.decode("utf-8", errors="replace"))
             log_file.write("\n=== STDERR ===\n")
-            log_file.write(result.stderr)
+            log_file.write(stderr.decode("utf-8", errors="replace"))
 
-        if result.returncode != 0:
+        if proc.returncode != 0:
             print(f"[SERVER] Pipeline failed for {call_id}. Check {log_path}", file=sys.stderr)
             processing_status[call_id] = "error"
         else:
@@ -108,10 +123,15 @@ def run_pipeline_thread(filepath: Path, call_id: str):
             processing_status[call_id] = "done"
             
     except Exception as e:
-        print(f"[SERVER] Exception in pipeline thread: {e}", file=sys.stderr)
+        print(f"[SERVER] Exception in pipeline task: {e}", file=sys.stderr)
         processing_status[call_id] = "error"
 
 # --- HELPER: Data Loader ---
+def read_json(path) -> Dict:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw.decode('utf-8'))
+
 def load_session_data(call_id: str) -> Optional[SessionDetail]:
     # Try to find matching output files
     # The pipeline generates timestamps, so we need to find files that MATCH the call_id if possible
@@ -128,10 +148,8 @@ def load_session_data(call_id: str) -> Optional[SessionDetail]:
         return None
         
     try:
-        with open(events_path, 'r', encoding='utf-8') as f:
-            events_data = json.load(f)
-        with open(vtot_path, 'r', encoding='utf-8') as f:
-            vtot_data = json.load(f)
+        events_data = read_json(events_path)
+        vtot_data = read_json(vtot_path)
             
         # Map VToT to Transcript
         transcript = []
@@ -183,7 +201,7 @@ def load_session_data(call_id: str) -> Optional[SessionDetail]:
             customer=customer_name,
             status=risk_level,
             audio_url=f"{AUDIO_BASE_URL}/{call_id}.wav", # Fallback if we don't have exact filename
-            tags=list(set(tags)),
+            tags=list(dict.fromkeys(tags)),
             transcript=transcript,
             aiFlags=ai_flags
         )
@@ -206,56 +224,92 @@ async def upload_file(file: UploadFile = File(...)):
     safe_filename = f"{call_id}.wav"
     file_path = INPUT_DIR / safe_filename
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Stream the upload in chunks so the event loop stays free for other requests
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
         
-    # Also copy to audio_public for frontend playback
+    # Also expose in audio_public for frontend playback; a hard link avoids
+    # a second full write when both dirs share a filesystem
     public_audio_path = AUDIO_DIR / safe_filename
-    shutil.copy(file_path, public_audio_path)
+    try:
+        os.link(file_path, public_audio_path)
+    except OSError:
+        shutil.copy(file_path, public_audio_path)
     
     # Trigger pipeline
-    threading.Thread(target=run_pipeline_thread, args=(file_path, call_id)).start()
+    task = asyncio.create_task(run_pipeline(file_path, call_id))
+    pipeline_tasks.add(task)
+    task.add_done_callback(pipeline_tasks.discard)
     
     return {"status": "processing", "id": call_id, "filename": safe_filename}
 
 
+# Parsed session summaries keyed by events file path: { path: (mtime, SessionSummary) }
+sessions_cache: Dict[str, tuple] = {}
+# Cold scans read and parse changed files in parallel; file I/O releases the GIL
+session_loader = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
+def load_session_summary(path: str, mtime: float) -> SessionSummary:
+    fname = Path(path).name
+    call_id = fname.replace("events_v2_", "").replace(".json", "")
+    
+    dat = read_json(path)
+    
+    summary = dat.get('summary', {})
+    high_risks = summary.get('high_risk_events', 0)
+    
+    # Map events to tags: first-seen order, deduped in one pass, limited for the UI
+    tags = list(dict.fromkeys(e['event_type'] for e in dat.get('events', []) if e.get('event_type')))[:3]
+    if not tags: tags = ["No Risks"]
+    
+    return SessionSummary(
+        id=call_id,
+        title=f"Call {call_id}",
+        date=dat.get('generated_at', str(datetime.fromtimestamp(mtime))),
+        duration=120, # Placeholder
+        agent="Agent",
+        customer="Customer",
+        status="Flagged" if high_risks > 0 else "Reviewed",
+        tags=tags
+    )
+
 @app.get("/sessions", response_model=List[SessionSummary])
 def get_sessions():
     """Scans the output directory for processed JSONs and returns summaries."""
-    sessions = []
-    import glob
-    files = glob.glob(str(OUTPUT_DIR / "events_v2_*.json"))
-    files.sort(key=os.path.getmtime, reverse=True)
+    # One directory pass; DirEntry.stat() reuses the scan's cached info where the OS provides it
+    entries = []
+    with os.scandir(OUTPUT_DIR) as it:
+        for e in it:
+            if e.name.startswith("events_v2_") and e.name.endswith(".json"):
+                try:
+                    entries.append((e.path, e.stat().st_mtime))
+                except OSError:
+                    continue
+    
+    # Only re-parse files that are new or changed since the last scan
+    seen = {f for f, _ in entries}
+    stale = [(f, mtime) for f, mtime in entries
+             if f not in sessions_cache or sessions_cache[f][0] != mtime]
     
-    for f in files:
+    def try_load(entry):
         try:
-            fname = Path(f).name
-            call_id = fname.replace("events_v2_", "").replace(".json", "")
-            
-            with open(f, 'r', encoding='utf-8') as json_file:
-                dat = json.load(json_file)
-                
-            summary = dat.get('summary', {})
-            high_risks = summary.get('high_risk_events', 0)
-            
-            # Map events to tags
-            tags = list(set([e.get('event_type') for e in dat.get('events', [])]))
-            if not tags: tags = ["No Risks"]
-            
-            sessions.append(SessionSummary(
-                id=call_id,
-                title=f"Call {call_id}",
-                date=dat.get('generated_at', str(datetime.fromtimestamp(os.path.getmtime(f)))),
-                duration=120, # Placeholder
-                agent="Agent",
-                customer="Customer",
-                status="Flagged" if high_risks > 0 else "Reviewed",
-                tags=tags[:3] # Limit tags for UI
-            ))
-        except:
-            continue
+            return load_session_summary(*entry)
+        except Exception:
+            return None
+    
+    for (f, mtime), summary in zip(stale, session_loader.map(try_load, stale)):
+        if summary is None:
+            seen.discard(f)
+        else:
+            sessions_cache[f] = (mtime, summary)
+    
+    # Drop entries for files that were deleted or no longer parse
+    for f in list(sessions_cache):
+        if f not in seen:
+            sessions_cache.pop(f, None)
             
-    return sessions
+    return [summary for _, summary in sorted(sessions_cache.values(), key=lambda x: x[0], reverse=True)]
 
 @app.get("/session/{id}", response_model=SessionDetail)
 def get_session_detail(id: str):
@@ -4,7 +4,8 @@ Thin wrapper for Backboard SDK to handle assistant creation, threads, and messag
 import json
 import sys
 import asyncio
-from typing import Dict, Optional, List
+import threading
+from typing import Callable, Dict, Optional, List
 
 try:
     from backboard import BackboardClient as BB
@@ -16,6 +17,9 @@ from config import BACKBOARD_API_KEY, DEFAULT_MODEL, ASSISTANT_NAME, ASSISTANT_I
 
 VERSION = "1.0.0"
 
+# In-flight requests per analyze_events_bulk / send_messages_bulk call
+BULK_CONCURRENCY = 8
+
 
 class BackboardWrapper:
     """Wrapper for Backboard.io API interactions with sync interface."""
@@ -35,20 +39,24 @@ class BackboardWrapper:
         self.client = BB(api_key=self.api_key)
         self.assistant_id: Optional[str] = None
         self.thread_id: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the wrapper's event loop, starting it on a daemon thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="backboard-loop", daemon=True).start()
+            return self._loop
     
     def _run_async(self, coro):
-        """Run an async coroutine synchronously."""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're already in an async context, create a new loop
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    future = pool.submit(asyncio.run, coro)
-                    return future.result()
-            return loop.run_until_complete(coro)
-        except RuntimeError:
-            return asyncio.run(coro)
+        """Run an async coroutine synchronously.
+        
+        All calls share one long-lived loop, so there is no per-call loop or thread
+        setup, and it works the same whether or not the caller is inside a running loop.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
     
     def create_assistant(self, name: Optional[str] = None, system_prompt: Optional[str] = None) -> str:
         """Create or get an assistant for call analysis.
@@ -118,23 +126,58 @@ class BackboardWrapper:
             response = self._run_async(
                 self.client.add_message(**kwargs)
             )
-            
-            # Extract response text
-            if hasattr(response, 'content') and response.content:
-                response_text = response.content
-            elif hasattr(response, 'text'):
-                response_text = response.text
-            elif isinstance(response, dict):
-                response_text = response.get('content', response.get('text', str(response)))
-            else:
-                response_text = str(response)
-            
-            return {"success": True, "response": response_text}
+            return {"success": True, "response": self._response_text(response)}
             
         except Exception as e:
             print(f"[ERROR] Message failed: {e}", file=sys.stderr)
             return {"success": False, "error": str(e)}
     
+    def send_messages_bulk(self, contents: List[str],
+                           on_done: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+        """Send independent messages concurrently, each on its own fresh thread.
+        
+        Args:
+            contents: Message contents to send
+            on_done: Called with (index, result) as each message completes
+        
+        Returns:
+            One result per message (same order), shaped like send_message's
+        """
+        aid = self.assistant_id or self.create_assistant()
+        
+        async def send(i: int, content: str, limit: asyncio.Semaphore) -> Dict:
+            async with limit:
+                try:
+                    thread = await self.client.create_thread(assistant_id=aid)
+                    kwargs = {"thread_id": str(thread.thread_id), "content": content}
+                    if self.model:
+                        kwargs["model_name"] = self.model
+                    response = await self.client.add_message(**kwargs)
+                    result = {"success": True, "response": self._response_text(response)}
+                except Exception as e:
+                    print(f"[ERROR] Message failed: {e}", file=sys.stderr)
+                    result = {"success": False, "error": str(e)}
+            if on_done:
+                on_done(i, result)
+            return result
+        
+        async def send_all() -> list:
+            limit = asyncio.Semaphore(BULK_CONCURRENCY)
+            return await asyncio.gather(*(send(i, c, limit) for i, c in enumerate(contents)))
+        
+        return self._run_async(send_all())
+    
+    @staticmethod
+    def _response_text(response) -> str:
+        """Extract the reply text from an add_message response."""
+        if hasattr(response, 'content') and response.content:
+            return response.content
+        elif hasattr(response, 'text'):
+            return response.text
+        elif isinstance(response, dict):
+            return response.get('content', response.get('text', str(response)))
+        return str(response)
+    
     def analyze_event(self, event: Dict, transcript_context: str = "") -> Dict:
         """Analyze a single event and return LLM interpretation.
         
@@ -151,13 +194,60 @@ class BackboardWrapper:
         if response.get("success"):
             return self._parse_analysis_response(response["response"])
         else:
-            return {
-                "summary": "Analysis unavailable",
-                "risk_level": "unknown",
-                "recommended_action": "Manual review required",
-                "confidence": 0.0,
-                "error": response.get("error")
-            }
+            return self._unavailable_analysis(response.get("error"))
+    
+    def analyze_events_bulk(self, events: List[Dict], contexts: List[str]) -> List[Optional[Dict]]:
+        """Analyze many events concurrently, each on its own fresh thread.
+        
+        Wall-clock is roughly one round trip per BULK_CONCURRENCY events instead
+        of one per event.
+        
+        Args:
+            events: Event dictionaries from EventGen.py
+            contexts: Transcript context for each event (same order)
+            
+        Returns:
+            One analysis per event, as from analyze_event; None where the
+            event's thread could not be created
+        """
+        aid = self.assistant_id or self.create_assistant()
+        
+        async def analyze(event: Dict, context: str, limit: asyncio.Semaphore) -> Dict:
+            async with limit:
+                thread = await self.client.create_thread(assistant_id=aid)
+                kwargs = {"thread_id": str(thread.thread_id),
+                          "content": self._build_analysis_prompt(event, context)}
+                if self.model:
+                    kwargs["model_name"] = self.model
+                try:
+                    response = await self.client.add_message(**kwargs)
+                except Exception as e:
+                    print(f"[ERROR] Message failed: {e}", file=sys.stderr)
+                    return self._unavailable_analysis(str(e))
+            return self._parse_analysis_response(self._response_text(response))
+        
+        async def analyze_all() -> list:
+            limit = asyncio.Semaphore(BULK_CONCURRENCY)
+            return await asyncio.gather(*(analyze(e, c, limit) for e, c in zip(events, contexts)),
+                                        return_exceptions=True)
+        
+        results = []
+        for result in self._run_async(analyze_all()):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Failed to create thread: {result}", file=sys.stderr)
+                result = None
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _unavailable_analysis(error: Optional[str]) -> Dict:
+        return {
+            "summary": "Analysis unavailable",
+            "risk_level": "unknown",
+            "recommended_action": "Manual review required",
+            "confidence": 0.0,
+            "error": error
+        }
     
     def _build_analysis_prompt(self, event: Dict, context: str) -> str:
         """Build the analysis prompt for an event."""
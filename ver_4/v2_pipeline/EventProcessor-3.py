@@ -4,8 +4,16 @@ Enhanced with speaker-id awareness and V2 schema support.
 
 import json
 import sys
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 VERSION = "1.1.0"
 ARTIFACT_TYPE = "unified_event_analysis"
@@ -15,6 +23,29 @@ ARTIFACT_TYPE = "unified_event_analysis"
 # RULE-BASED EVENT DETECTION (Enhanced for V2)
 # ============================================================================
 
+@dataclass
+class Event:
+    """One detected event; llm_analysis is filled in by interpret_events"""
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10;
+    # a class-level default would clash with the slot, so llm_analysis is passed explicitly
+    __slots__ = ('event_type', 'speaker_id', 'sentence_index', 'timestamp', 'evidence',
+                 'financial_context', 'explanation', 'suggested_action', 'llm_analysis')
+    event_type: str
+    speaker_id: str
+    sentence_index: int
+    timestamp: Dict
+    evidence: List[Dict]
+    financial_context: Dict
+    explanation: str
+    suggested_action: str
+    llm_analysis: Optional[Dict]
+    
+    def to_dict(self) -> Dict:
+        """JSON form, in field order; llm_analysis only once set"""
+        return {k: getattr(self, k) for k in self.__slots__
+                if k != 'llm_analysis' or self.llm_analysis is not None}
+
+
 class EventDetector:
     """Pure, deterministic, rule-based event detection."""
     
@@ -23,9 +54,41 @@ class EventDetector:
         self.signals = signals_data.get('sentences', [])
         self.markers = markers_data.get('sentences', [])
         self.context = context_data.get('context', {})
-        self.events: List[Dict] = []
+        self.events: List[Event] = []
+        
+        # Per-sentence speaker/timing and call-level context, read once for every _emit
+        self._speakers = [s.get('speaker_id', 'unknown') for s in self.sentences]
+        self._starts = [s.get('start', 0) for s in self.sentences]
+        self._ends = [s.get('end', 0) for s in self.sentences]
+        self._band = self.context.get('amount', {}).get('band', 'unknown')
+        self._sensitivity = self.context.get('product', {}).get('sensitivity', 'unknown')
+        
+        # Sentence indices carrying each marker type / category, in order: rules loop over
+        # just the sentences holding their trigger marker
+        self._type_index: Dict[str, List[int]] = defaultdict(list)
+        self._category_index: Dict[str, List[int]] = defaultdict(list)
+        self._matched_currency: List[str] = []
+        for idx, s in enumerate(self.markers):
+            markers = s.get('markers', [])
+            for m in markers:
+                for index, key in ((self._type_index, m.get('type')), (self._category_index, m.get('category'))):
+                    if not index[key] or index[key][-1] != idx:
+                        index[key].append(idx)
+            self._matched_currency.append(next((m.get('matched_text', '') for m in markers
+                                                if m.get('category') == 'currency_amount'), ''))
+        # Per-sentence boolean masks per marker type and indicator, so window checks are slice .any() calls
+        self._types: Dict[str, np.ndarray] = {}
+        self._indicators: Dict[str, np.ndarray] = {}
+        for t, indices in self._type_index.items():
+            self._types[t] = np.zeros(len(self.markers), dtype=bool)
+            self._types[t][indices] = True
+        for idx, s in enumerate(self.signals):
+            for i in s.get('indicators', []):
+                self._indicators.setdefault(i.get('indicator'), np.zeros(len(self.signals), dtype=bool))[idx] = True
+        # Hesitation as used by the affordability and pressure rules
+        self._hesitation = self._indicator('speed_deviation') | self._indicator('pause_count_increase')
     
-    def detect(self) -> List[Dict]:
+    def detect(self) -> List[Event]:
         """Run all detection rules and return events."""
         self._rule_consent_uncertainty()
         self._rule_affordability_signal()
@@ -34,52 +97,34 @@ class EventDetector:
         self._rule_consent_gap()
         return self.events
     
-    def _amount_band(self) -> str:
-        return self.context.get('amount', {}).get('band', 'unknown')
-    
-    def _product_sensitivity(self) -> str:
-        return self.context.get('product', {}).get('sensitivity', 'unknown')
-    
-    def _has_marker_type(self, idx: int, marker_type: str) -> bool:
-        if idx >= len(self.markers): return False
-        return any(m.get('type') == marker_type for m in self.markers[idx].get('markers', []))
+    def _marker_type(self, marker_type: str) -> np.ndarray:
+        return self._types.get(marker_type, np.zeros(len(self.markers), dtype=bool))
     
-    def _has_marker_category(self, idx: int, category: str) -> bool:
-        if idx >= len(self.markers): return False
-        return any(m.get('category') == category for m in self.markers[idx].get('markers', []))
-    
-    def _has_indicator(self, idx: int, indicator: str) -> bool:
-        if idx >= len(self.signals): return False
-        return any(i.get('indicator') == indicator for i in self.signals[idx].get('indicators', []))
-    
-    def _get_speaker(self, idx: int) -> str:
-        """Get speaker ID for a sentence if available (V2 feature)."""
-        if idx < len(self.sentences):
-            return self.sentences[idx].get('speaker_id', 'unknown')
-        return 'unknown'
+    def _indicator(self, indicator: str) -> np.ndarray:
+        return self._indicators.get(indicator, np.zeros(len(self.signals), dtype=bool))
     
     def _emit(self, event_type: str, idx: int, evidence: List[Dict], explanation: str, action: str):
-        sent = self.sentences[idx] if idx < len(self.sentences) else {}
-        self.events.append({
-            "event_type": event_type,
-            "speaker_id": self._get_speaker(idx),
-            "sentence_index": idx,
-            "timestamp": {"start": sent.get('start', 0), "end": sent.get('end', 0)},
-            "evidence": evidence,
-            "financial_context": {"amount_band": self._amount_band(), "product_sensitivity": self._product_sensitivity()},
-            "explanation": explanation,
-            "suggested_action": action
-        })
+        # Speaker ID is a V2 feature; markers past the transcript's end get the defaults
+        known = idx < len(self.sentences)
+        self.events.append(Event(
+            event_type=event_type,
+            speaker_id=self._speakers[idx] if known else 'unknown',
+            sentence_index=idx,
+            timestamp={"start": self._starts[idx], "end": self._ends[idx]} if known else {"start": 0, "end": 0},
+            evidence=evidence,
+            financial_context={"amount_band": self._band, "product_sensitivity": self._sensitivity},
+            explanation=explanation,
+            suggested_action=action,
+            llm_analysis=None
+        ))
     
     def _rule_consent_uncertainty(self):
         """IF: customer_commitment AND no regulatory_prompt in prior 3 AND behavioral hesitation THEN: emit"""
-        for idx in range(len(self.markers)):
-            if not self._has_marker_type(idx, 'customer_commitment'): continue
-            prior_reg = [i for i in range(max(0, idx-3), idx) if self._has_marker_type(i, 'regulatory_prompt')]
-            if prior_reg: continue
-            hesitation = (self._has_indicator(idx, 'pause_count_increase') or 
-                         self._has_indicator(idx, 'speed_deviation') or self._has_indicator(idx, 'agreement_pattern'))
-            if not hesitation: continue
+        reg = self._marker_type('regulatory_prompt')
+        hesitation = self._hesitation | self._indicator('agreement_pattern')
+        for idx in self._type_index.get('customer_commitment', ()):
+            if reg[max(0, idx-3):idx].any(): continue
+            if idx >= len(hesitation) or not hesitation[idx]: continue
             self._emit("commitment_without_consent", idx,
                 [{"source": "TextEXT", "marker": "customer_commitment", "sentence": idx},
                  {"source": "Interpret", "indicator": "behavioral_hesitation", "sentence": idx}],
@@ -88,31 +133,27 @@ class EventDetector:
     
     def _rule_affordability_signal(self):
         """IF: currency_amount mentioned AND behavioral hesitation within ±1 sentence THEN: emit"""
-        for idx in range(len(self.markers)):
-            if not self._has_marker_category(idx, 'currency_amount'): continue
-            hesitation_range = [i for i in range(max(0, idx-1), min(len(self.signals), idx+2)) 
-                               if self._has_indicator(i, 'speed_deviation') or self._has_indicator(i, 'pause_count_increase')]
+        for idx in self._category_index.get('currency_amount', ()):
+            lo = max(0, idx-1)
+            hesitation_range = (np.flatnonzero(self._hesitation[lo:idx+2]) + lo).tolist()
             if not hesitation_range: continue
-            markers_in_idx = self.markers[idx].get('markers', [])
-            matched = next((m.get('matched_text', '') for m in markers_in_idx if m.get('category') == 'currency_amount'), '')
+            matched = self._matched_currency[idx]
             
             self._emit("affordability_signal", idx,
                 [{"source": "TextEXT", "marker": "currency_amount", "matched": matched, "sentence": idx},
                  {"source": "Interpret", "indicator": "behavioral_hesitation", "sentences": hesitation_range},
-                 {"source": "FinContext", "amount_band": self._amount_band()}],
-                f"Affordability signal at sentence {idx}, amount_band={self._amount_band()}",
+                 {"source": "FinContext", "amount_band": self._band}],
+                f"Affordability signal at sentence {idx}, amount_band={self._band}",
                 "affordability_check")
     
     def _rule_pressure_review(self):
         """IF: urgency_language AND sales_prompt within 2 sentences AND hesitation THEN: emit"""
-        for idx in range(len(self.markers)):
-            if not self._has_marker_type(idx, 'urgency_language'): continue
-            nearby_sales = [i for i in range(max(0, idx-2), min(len(self.markers), idx+3)) 
-                           if self._has_marker_type(i, 'sales_prompt')]
+        sales = self._marker_type('sales_prompt')
+        for idx in self._type_index.get('urgency_language', ()):
+            lo = max(0, idx-2)
+            nearby_sales = (np.flatnonzero(sales[lo:idx+3]) + lo).tolist()
             if not nearby_sales: continue
-            hesitation_found = any(self._has_indicator(i, 'speed_deviation') or self._has_indicator(i, 'pause_count_increase')
-                                  for i in range(max(0, idx-1), min(len(self.signals), idx+2)))
-            if not hesitation_found: continue
+            if not self._hesitation[max(0, idx-1):idx+2].any(): continue
             self._emit("pressure_review", idx,
                 [{"source": "TextEXT", "marker": "urgency_language", "sentence": idx},
                  {"source": "TextEXT", "marker": "sales_prompt", "sentences": nearby_sales},
@@ -122,9 +163,8 @@ class EventDetector:
     
     def _rule_pii_sensitive_call(self):
         """IF: pii_disclosure detected AND product_sensitivity is high THEN: emit"""
-        if self._product_sensitivity() != 'high': return
-        for idx in range(len(self.markers)):
-            if not self._has_marker_type(idx, 'pii_disclosure'): continue
+        if self._sensitivity != 'high': return
+        for idx in self._type_index.get('pii_disclosure', ()):
             self._emit("pii_sensitive_call", idx,
                 [{"source": "TextEXT", "marker": "pii_disclosure", "sentence": idx},
                  {"source": "FinContext", "product_sensitivity": "high"}],
@@ -133,12 +173,9 @@ class EventDetector:
     
     def _rule_consent_gap(self):
         """IF: financial_entity AND no regulatory_prompt in entire call AND customer_commitment THEN: emit"""
-        has_reg_prompt = any(self._has_marker_type(i, 'regulatory_prompt') for i in range(len(self.markers)))
-        if has_reg_prompt: return
-        has_financial = any(self._has_marker_type(i, 'financial_entity') for i in range(len(self.markers)))
-        if not has_financial: return
-        for idx in range(len(self.markers)):
-            if not self._has_marker_type(idx, 'customer_commitment'): continue
+        if self._type_index.get('regulatory_prompt'): return
+        if not self._type_index.get('financial_entity'): return
+        for idx in self._type_index.get('customer_commitment', ()):
             self._emit("consent_gap", idx,
                 [{"source": "TextEXT", "marker": "customer_commitment", "sentence": idx},
                  {"source": "TextEXT", "marker": "no_regulatory_prompt_in_call"}],
@@ -184,52 +221,41 @@ FALLBACK_ANALYSIS = {
 }
 
 
-def get_transcript_context(vtot_data: Dict, event: Dict, window: int = 2) -> str:
+def build_context_lines(vtot_data: Dict) -> List[str]:
+    """Format every transcript sentence once as '[t] (speaker): text' for event context."""
+    return [f"[{s.get('start', 0):.1f}s] ({s.get('speaker_id', 'unknown')}): {s.get('text', '')}"
+            for s in vtot_data.get('sentences', [])]
+
+
+def get_transcript_context(lines: List[str], event: Event, window: int = 2) -> str:
     """Extract relevant transcript context around an event with Speaker IDs."""
-    sentences = vtot_data.get('sentences', [])
-    event_idx = event.get('sentence_index', 0)
-    
+    event_idx = event.sentence_index
     start_idx = max(0, event_idx - window)
-    end_idx = min(len(sentences), event_idx + window + 1)
-    
-    lines = []
-    for i in range(start_idx, end_idx):
-        s = sentences[i] if i < len(sentences) else {}
-        marker = ">>>" if i == event_idx else "   "
-        text = s.get('text', '')
-        speaker = s.get('speaker_id', 'unknown')
-        timestamp = f"[{s.get('start', 0):.1f}s]"
-        lines.append(f"{marker} {timestamp} ({speaker}): {text}")
-    
-    return "\n".join(lines)
+    return "\n".join((">>> " if i == event_idx else "    ") + line
+                     for i, line in enumerate(lines[start_idx:event_idx + window + 1], start_idx))
 
 
-def get_llm_analysis(event: Dict, transcript_context: str, client) -> Dict:
-    """Get LLM analysis for an event."""
-    try:
-        client.create_thread()
-        analysis = client.analyze_event(event, transcript_context)
-        analysis["analysis_source"] = "llm"
-        return analysis
-    except Exception as e:
-        print(f"[WARN] LLM analysis failed: {e}", file=sys.stderr)
-        return get_fallback_analysis(event)
+# Finalized fallback analyses, built once and shared by every event of that type (treat as read-only)
+_FALLBACK_FINAL = {k: {**v, "analysis_source": "fallback"} for k, v in FALLBACK_ANALYSIS.items()}
 
 
-def get_fallback_analysis(event: Dict) -> Dict:
+def get_fallback_analysis(event: Event) -> Dict:
     """Get rule-based fallback analysis."""
-    event_type = event.get('event_type', '')
-    base = FALLBACK_ANALYSIS.get(event_type, {
+    event_type = event.event_type
+    final = _FALLBACK_FINAL.get(event_type)
+    if final is not None:
+        return final
+    return {
         "summary": f"Event detected: {event_type}",
         "risk_level": "medium",
         "recommended_action": "Manual review recommended",
-        "confidence": 0.5
-    })
-    return {**base, "analysis_source": "fallback"}
+        "confidence": 0.5,
+        "analysis_source": "fallback"
+    }
 
 
-def interpret_events(events: List[Dict], vtot_data: Optional[Dict], enable_llm: bool) -> List[Dict]:
-    """Add interpretation to each event."""
+def interpret_events(events: List[Event], vtot_data: Optional[Dict], enable_llm: bool) -> List[Dict]:
+    """Add interpretation to each event; returns the events in their JSON form."""
     client = None
     if enable_llm:
         try:
@@ -241,19 +267,25 @@ def interpret_events(events: List[Dict], vtot_data: Optional[Dict], enable_llm:
             print(f"[WARN] LLM unavailable, using fallback: {e}", file=sys.stderr)
             client = None
     
-    interpreted_events = []
-    for event in events:
-        context = get_transcript_context(vtot_data, event) if vtot_data else ""
-        if client:
-            analysis = get_llm_analysis(event, context, client)
-        else:
-            analysis = get_fallback_analysis(event)
-        
-        interpreted_event = {**event, "llm_analysis": analysis}
-        interpreted_events.append(interpreted_event)
-        print(f"[INFO] Processed: {event.get('event_type')} for {event.get('speaker_id')} [{analysis['analysis_source']}]", file=sys.stderr)
+    analyses = [None] * len(events)
+    if client and events:
+        # All events go out concurrently rather than one round trip at a time, each on
+        # its own Backboard thread; analyses come back in event order
+        lines = build_context_lines(vtot_data) if vtot_data else []
+        contexts = [get_transcript_context(lines, event) if vtot_data else "" for event in events]
+        try:
+            analyses = client.analyze_events_bulk([event.to_dict() for event in events], contexts)
+            for analysis in analyses:
+                if analysis:
+                    analysis["analysis_source"] = "llm"
+        except Exception as e:
+            print(f"[WARN] LLM analysis failed: {e}", file=sys.stderr)
+    
+    for event, analysis in zip(events, analyses):
+        event.llm_analysis = analysis or get_fallback_analysis(event)
+        print(f"[INFO] Processed: {event.event_type} for {event.speaker_id} [{event.llm_analysis['analysis_source']}]", file=sys.stderr)
     
-    return interpreted_events
+    return [event.to_dict() for event in events]
 
 
 def generate_and_interpret_events(
@@ -269,32 +301,62 @@ def generate_and_interpret_events(
     
     interpreted_events = interpret_events(events, vtot_data, enable_llm)
     
-    call_id = financial_context.get('context', {}).get('call_id', f"CALL-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}")
+    now = datetime.now(timezone.utc)
+    call_id = financial_context.get('context', {}).get('call_id', f"CALL-{now.strftime('%Y%m%d%H%M%S')}")
+    
+    # Source and risk tallies in one pass
+    llm_count = fallback_count = high_risk = 0
+    for e in interpreted_events:
+        analysis = e.get('llm_analysis', {})
+        source = analysis.get('analysis_source')
+        if source == 'llm': llm_count += 1
+        elif source == 'fallback': fallback_count += 1
+        if analysis.get('risk_level') == 'high': high_risk += 1
     
     return {
         "artifact_type": ARTIFACT_TYPE,
         "version": VERSION,
-        "generated_at": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        "generated_at": now.isoformat().replace('+00:00', 'Z'),
         "llm_enabled": enable_llm,
         "call_id": call_id,
         "events": interpreted_events,
         "summary": {
             "total_events": len(interpreted_events),
             "events_by_source": {
-                "llm": len([e for e in interpreted_events if e.get('llm_analysis', {}).get('analysis_source') == 'llm']),
-                "fallback": len([e for e in interpreted_events if e.get('llm_analysis', {}).get('analysis_source') == 'fallback'])
+                "llm": llm_count,
+                "fallback": fallback_count
             },
-            "high_risk_events": len([e for e in interpreted_events if e.get('llm_analysis', {}).get('risk_level') == 'high'])
+            "high_risk_events": high_risk
         }
     }
 
 
+def load_json_bytes(raw: bytes):
+    """Parse JSON bytes, picking the codec from the BOM (PowerShell redirects write UTF-16)"""
+    if raw[:3] == b'\xef\xbb\xbf': raw = raw[3:]
+    elif raw[:2] in (b'\xff\xfe', b'\xfe\xff'): return json.loads(raw.decode('utf-16'))
+    if orjson:
+        try: return orjson.loads(raw)
+        except ValueError: pass  # BOM-less UTF-16 or stray non-UTF-8 bytes: left to the stdlib
+    try: return json.loads(raw)
+    except UnicodeDecodeError: return json.loads(raw.decode('utf-8', errors='replace'))
+
+
 def load_json(path: str) -> Dict:
-    for enc in ['utf-8-sig', 'utf-8', 'utf-16']:
-        try:
-            with open(path, 'r', encoding=enc) as f: return json.load(f)
-        except: pass
-    return {}
+    try:
+        with open(path, 'rb') as f: return load_json_bytes(f.read())
+    except (OSError, ValueError):
+        return {}
+
+
+def emit(obj) -> None:
+    """Write obj to stdout as indented JSON; orjson's UTF-8 bytes go straight to the buffer"""
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n")
+        sys.stdout.flush()
+    else:
+        print(json.dumps(obj, indent=2))
 
 
 def main():
@@ -302,7 +364,7 @@ def main():
     args = [a for a in sys.argv[1:] if not a.startswith('--')]
     
     if len(args) < 4:
-        print(json.dumps({"error": "usage: EventProcessor.py vtot.json signals.json markers.json context.json [--no-llm]"}, indent=2))
+        emit({"error": "usage: EventProcessor.py vtot.json signals.json markers.json context.json [--no-llm]"})
         sys.exit(1)
     
     vtot_data = load_json(args[0])
@@ -317,7 +379,7 @@ def main():
         financial_context=financial_context,
         enable_llm=use_llm
     )
-    print(json.dumps(result, indent=2))
+    emit(result)
 
 
 if __name__ == "__main__":
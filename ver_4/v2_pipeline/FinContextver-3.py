@@ -3,10 +3,15 @@ Converts external call metadata into normalized financial context.
 IMPORTANT: Context is built ONLY from confirmed markers and known metadata.
 Never derives context from behavioral signals. Does not imply risk or outcome."""
 
-import json, sys
+import bisect, functools, json, sys
 from typing import Dict, Optional
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 VERSION, ARTIFACT_TYPE = "1.1.0", "financial_context"
 
 # === EXPLICIT RULE TABLES (no ML, no hidden logic) ===
@@ -16,6 +21,10 @@ AMOUNT_BANDS = [  # (min, max, band_name)
     (500, 1000, "elevated"), (1000, float('inf'), "high")
 ]
 
+# Band upper bounds for bisect (bands are contiguous and sorted)
+_BAND_BOUNDS = [max_v for _, max_v, _ in AMOUNT_BANDS]
+_BAND_NAMES = [band for _, _, band in AMOUNT_BANDS]
+
 PRODUCT_SENSITIVITY = {  # product_type -> sensitivity_level
     "subscription": "standard", "map_update": "standard", "software": "standard",
     "warranty": "elevated", "insurance": "elevated", "protection_plan": "elevated",
@@ -31,25 +40,37 @@ CUSTOMER_PRIORITY = {  # customer_type -> priority_level
 def classify_amount(amount: Optional[float]) -> Dict:
     """Map numeric amount to band using explicit rules."""
     if amount is None: return {"band": "unknown", "value": None}
-    for min_v, max_v, band in AMOUNT_BANDS:
-        if min_v <= amount < max_v:
-            return {"band": band, "value": amount}
-    return {"band": "unknown", "value": amount}
+    # Written so NaN also falls outside every band
+    if not AMOUNT_BANDS[0][0] <= amount < _BAND_BOUNDS[-1]:
+        return {"band": "unknown", "value": amount}
+    return {"band": _BAND_NAMES[bisect.bisect_right(_BAND_BOUNDS, amount)], "value": amount}
+
+# Normalization + lookup are memoized as immutable tuples; callers get a fresh dict each time
+@functools.lru_cache(maxsize=256)
+def _product_key(product_type: str) -> tuple:
+    pt = product_type.lower().replace(" ", "_").replace("-", "_")
+    return pt, PRODUCT_SENSITIVITY.get(pt, "standard")
+
+@functools.lru_cache(maxsize=256)
+def _customer_key(customer_type: str) -> tuple:
+    ct = customer_type.lower().replace(" ", "_")
+    return ct, CUSTOMER_PRIORITY.get(ct, "standard")
 
 def classify_product(product_type: Optional[str]) -> Dict:
     """Map product type to sensitivity using lookup table."""
     if not product_type: return {"type": None, "sensitivity": "unknown"}
-    pt = product_type.lower().replace(" ", "_").replace("-", "_")
-    sensitivity = PRODUCT_SENSITIVITY.get(pt, "standard")
+    pt, sensitivity = _product_key(product_type)
     return {"type": pt, "sensitivity": sensitivity}
 
 def classify_customer(customer_type: Optional[str]) -> Dict:
     """Map customer type to priority using lookup table."""
     if not customer_type: return {"type": None, "priority": "unknown"}
-    ct = customer_type.lower().replace(" ", "_")
-    priority = CUSTOMER_PRIORITY.get(ct, "standard")
+    ct, priority = _customer_key(customer_type)
     return {"type": ct, "priority": priority}
 
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', '') + "Z"
+
 def inject_context(metadata: Dict) -> Dict:
     """
     Convert external metadata into normalized financial context.
@@ -64,14 +85,15 @@ def inject_context(metadata: Dict) -> Dict:
     
     Output: Versioned financial context JSON
     """
+    now = _now_iso()
     return {
         "artifact_type": ARTIFACT_TYPE,
         "version": VERSION,
-        "generated_at": datetime.now(timezone.utc).isoformat().replace('+00:00', '') + "Z",
+        "generated_at": now,
         "context": {
             "call_id": metadata.get("call_id"),
             "agent_id": metadata.get("agent_id"),
-            "timestamp": metadata.get("timestamp", datetime.now(timezone.utc).isoformat().replace('+00:00', '') + "Z"),
+            "timestamp": metadata.get("timestamp", now),
             "amount": classify_amount(metadata.get("amount")),
             "product": classify_product(metadata.get("product_type")),
             "customer": classify_customer(metadata.get("customer_type"))
@@ -79,6 +101,15 @@ def inject_context(metadata: Dict) -> Dict:
         "rules_applied": ["amount_band_classification", "product_sensitivity_lookup", "customer_priority_lookup"]
     }
 
+def emit(obj) -> None:
+    """Write obj to stdout as indented JSON; orjson's UTF-8 bytes go straight to the buffer"""
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n")
+        sys.stdout.flush()
+    else:
+        print(json.dumps(obj, indent=2))
+
 def main():
     """Accept JSON metadata from file, stdin, or CLI args."""
     metadata = {}
@@ -86,7 +117,8 @@ def main():
     if len(sys.argv) >= 2:
         # Try file first
         try:
-            with open(sys.argv[1], 'r') as f: metadata = json.load(f)
+            with open(sys.argv[1], 'rb') as f: raw = f.read()
+            metadata = orjson.loads(raw) if orjson else json.loads(raw)
         except:
             # Parse CLI args: key=value pairs
             for arg in sys.argv[1:]:
@@ -96,6 +128,6 @@ def main():
     elif not sys.stdin.isatty():
         metadata = json.load(sys.stdin)
     
-    print(json.dumps(inject_context(metadata), indent=2))
+    emit(inject_context(metadata))
 
 if __name__ == "__main__": main()
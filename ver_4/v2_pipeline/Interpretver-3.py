@@ -4,103 +4,198 @@ Evidence-based indicators only - no emotion or intent inference."""
 
 import json, sys
 from typing import Dict, List, Optional
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return args[0] if args and callable(args[0]) else (lambda f: f)
 
 VERSION, ARTIFACT_TYPE = "1.2.0", "behavioral_signal_transform"
 GRADE_THRESHOLD, EXTREME_THRESHOLD, LOW_CONF = 0.5, 0.9, 0.3
 BASELINE_WINDOW, WARMUP = 5, 5
 MIN_WORDS_FOR_BASELINE = 3  # Exclude ultra-short sentences from baseline
+_AGREE = frozenset({'yes','yeah','okay','ok','sure','right','alright','fine','yep','yup'})
+
+# Columns of the grade/baseline matrices returned by _score_sentences
+G_SPEED, G_PAUSE, G_FILLER, G_WC, G_AGREE = range(5)
+# Per-sentence measurement record (aligned so field views stay aligned for Numba)
+MEASURE_DTYPE = np.dtype([('wc', 'f8'), ('conf', 'f8'), ('speed', 'f8'), ('pause', 'f8'),
+                          ('filler', 'f8'), ('agree', '?')], align=True)
 
+@njit(cache=True)
 def grade(cur: float, base: float) -> float:
     return min(1.0, abs(cur - base) / base) if base else 0.0
 
-def baseline(hist: List[float], w: int = BASELINE_WINDOW) -> Optional[float]:
-    return sum(hist[-w:]) / len(hist[-w:]) if hist else None
-
-def detect(idx: int, m: Dict, b: Dict, prev_wc: Optional[int], warmup: bool) -> tuple:
-    indicators, speed, pause, conf, wc, filler = [], m['speed'], m['pause'], m['conf'], m['wc'], m['filler']
-
-    if conf > 0 and conf < LOW_CONF:
-        return [{"indicator": "data_quality_issue", "grade": round(1-conf, 2), 
-                 "evidence": f"avg_acoustic_confidence={conf:.3f} below {LOW_CONF}"}], True
-
-    if not warmup:
-        if b.get('speed') and speed > 0:
-            g = grade(speed, b['speed'])
-            if g >= GRADE_THRESHOLD:
-                indicators.append({"indicator": "speed_deviation", "grade": round(g, 2),
-                    "evidence": f"speech_speed_wpm={speed} {'above' if speed > b['speed'] else 'below'} baseline={b['speed']:.1f}"})
-
-        if b.get('pause') is not None and pause > b['pause']:
-            g = grade(pause, b['pause']) if b['pause'] > 0 else 0.5
-            if g >= GRADE_THRESHOLD:
-                indicators.append({"indicator": "pause_count_increase", "grade": round(g, 2),
-                    "evidence": f"pause_count={pause} above baseline={b['pause']:.1f}"})
-
-        if b.get('filler') is not None and filler > b['filler']:
-            g = grade(filler, b['filler']) if b['filler'] > 0 else (0.5 if filler >= 1 else 0)
-            if g >= GRADE_THRESHOLD:
-                indicators.append({"indicator": "filler_increase", "grade": round(g, 2),
-                    "evidence": f"filler_count={filler} above baseline={b['filler']:.1f}"})
-
-        if b.get('wc') and wc > 0:
-            g = grade(wc, b['wc'])
-            if g >= GRADE_THRESHOLD:
-                indicators.append({"indicator": "word_count_deviation", "grade": round(g, 2),
-                    "evidence": f"word_count={wc} {'above' if wc > b['wc'] else 'below'} baseline={b['wc']:.1f}"})
-
-        if m['text'] and wc <= 3 and prev_wc and prev_wc >= wc * 2:
-            tok = m['text'].lower().split()[0].strip('.,!?') if m['text'].split() else ""
-            if tok in {'yes','yeah','okay','ok','sure','right','alright','fine','yep','yup'}:
-                g = min(1.0, prev_wc / (wc * 3)) if wc > 0 else 0.5
+@njit(cache=True)
+def _push(ring, sums, counts, k: int, v: float) -> None:
+    """Append v to metric k's rolling window, keeping its running sum in O(1)"""
+    w = ring.shape[1]
+    slot = counts[k] % w
+    if counts[k] >= w:
+        sums[k] -= ring[k, slot]
+    ring[k, slot] = v
+    sums[k] += v
+    counts[k] += 1
+
+@njit(cache=True)
+def _mean(sums, counts, k: int, w: int) -> float:
+    return sums[k] / min(counts[k], w) if counts[k] else np.nan
+
+def starts_with_agreement(text: str) -> bool:
+    first = text.split(None, 1)
+    return bool(first) and first[0].lower().strip('.,!?') in _AGREE
+
+# Eager signature: compiled (or loaded from the on-disk cache) at import, not on first call.
+# f8[:]/b1[:] are any-layout so the strided MEASURE_DTYPE field views match directly
+@njit("Tuple((f8[:,:], f8[:,:], b1[:]))(f8[:], f8[:], f8[:], f8[:], f8[:], b1[:])", cache=True)
+def _score_sentences(wc, conf, speed, pause, filler, agree):
+    """Numeric kernel: per-sentence grades (-1 = no indicator), baselines and low-quality mask"""
+    n = len(wc)
+    grades = np.full((n, 5), -1.0)
+    bases = np.full((n, 4), np.nan)
+    low_q = np.zeros(n, dtype=np.bool_)
+    # Rolling baseline windows, one row per G_SPEED..G_WC metric
+    ring = np.empty((4, BASELINE_WINDOW))
+    sums = np.zeros(4)
+    counts = np.zeros(4, dtype=np.int64)
+
+    for i in range(n):
+        if conf[i] > 0 and conf[i] < LOW_CONF:
+            low_q[i] = True
+            continue
+
+        for k in range(4):
+            bases[i, k] = _mean(sums, counts, k, BASELINE_WINDOW)
+        b_speed, b_pause, b_filler, b_wc = bases[i, G_SPEED], bases[i, G_PAUSE], bases[i, G_FILLER], bases[i, G_WC]
+        extreme = False
+
+        if i >= WARMUP:
+            if counts[G_SPEED] and b_speed != 0 and speed[i] > 0:
+                g = grade(speed[i], b_speed)
                 if g >= GRADE_THRESHOLD:
-                    indicators.append({"indicator": "agreement_pattern", "grade": round(g, 2),
-                        "evidence": f"word_count={wc} starts_with='{tok}' prev_word_count={prev_wc}"})
+                    grades[i, G_SPEED] = g
 
-    return indicators, False
+            if counts[G_PAUSE] and pause[i] > b_pause:
+                g = grade(pause[i], b_pause) if b_pause > 0 else 0.5
+                if g >= GRADE_THRESHOLD:
+                    grades[i, G_PAUSE] = g
 
-def transform(data: Dict) -> Dict:
-    sents, out, hist, prev_wc = data.get('sentences', []), [], {'speed':[],'pause':[],'conf':[],'wc':[],'filler':[]}, None
+            if counts[G_FILLER] and filler[i] > b_filler:
+                g = grade(filler[i], b_filler) if b_filler > 0 else (0.5 if filler[i] >= 1 else 0.0)
+                if g >= GRADE_THRESHOLD:
+                    grades[i, G_FILLER] = g
 
-    for idx, s in enumerate(sents):
-        sp = s.get('speech', {})
-        m = {'wc': sp.get('word_count',0), 'conf': sp.get('confidence',0), 'speed': sp.get('speed_wpm',0),
-             'pause': sp.get('pause_count',0), 'filler': sp.get('filler_count',0), 'text': s.get('text','')}
+            if counts[G_WC] and b_wc != 0 and wc[i] > 0:
+                g = grade(wc[i], b_wc)
+                if g >= GRADE_THRESHOLD:
+                    grades[i, G_WC] = g
 
-        b = {k: baseline(v) for k, v in hist.items()}
-        indicators, low_q = detect(idx, m, b, prev_wc, idx < WARMUP)
+            prev_wc = wc[i - 1] if i > 0 else 0.0
+            if agree[i] and wc[i] <= 3 and prev_wc and prev_wc >= wc[i] * 2:
+                g = min(1.0, prev_wc / (wc[i] * 3)) if wc[i] > 0 else 0.5
+                if g >= GRADE_THRESHOLD:
+                    grades[i, G_AGREE] = g
 
-        out.append({"sentence_index": idx, "timestamp": {"start": s.get('start',0), "end": s.get('end',0)},
-            "measurements": {"word_count": m['wc'], "avg_acoustic_confidence": round(m['conf'],3),
-                "speech_speed_wpm": m['speed'], "pause_count": m['pause'], 
-                "pause_duration": sp.get('pause_duration',0), "filler_count": m['filler']},
-            "indicators": indicators})
+            for j in range(5):
+                if round(grades[i, j], 2) > EXTREME_THRESHOLD:
+                    extreme = True
 
         # Only update baselines with valid sentences (not low quality, not extreme, not ultra-short)
-        valid_for_baseline = (
-            not low_q and 
-            not any(i['grade'] > EXTREME_THRESHOLD for i in indicators) and
-            m['wc'] >= MIN_WORDS_FOR_BASELINE  # Exclude ultra-short sentences
-        )
-        if valid_for_baseline:
-            if m['speed'] > 0: hist['speed'].append(m['speed'])
-            hist['pause'].append(m['pause'])
-            if m['conf'] > 0: hist['conf'].append(m['conf'])
-            hist['wc'].append(m['wc'])
-            hist['filler'].append(m['filler'])
-        prev_wc = m['wc']
+        if not extreme and wc[i] >= MIN_WORDS_FOR_BASELINE:
+            if speed[i] > 0:
+                _push(ring, sums, counts, G_SPEED, speed[i])
+            _push(ring, sums, counts, G_PAUSE, pause[i])
+            _push(ring, sums, counts, G_WC, wc[i])
+            _push(ring, sums, counts, G_FILLER, filler[i])
+
+    return grades, bases, low_q
+
+def build_indicators(sp: Dict, text: str, g, b, prev_wc: Optional[int]) -> List[Dict]:
+    indicators = []
+    speed, pause, wc, filler = sp.get('speed_wpm',0), sp.get('pause_count',0), sp.get('word_count',0), sp.get('filler_count',0)
+    if g[G_SPEED] >= 0:
+        indicators.append({"indicator": "speed_deviation", "grade": round(float(g[G_SPEED]), 2),
+            "evidence": f"speech_speed_wpm={speed} {'above' if speed > b[G_SPEED] else 'below'} baseline={b[G_SPEED]:.1f}"})
+    if g[G_PAUSE] >= 0:
+        indicators.append({"indicator": "pause_count_increase", "grade": round(float(g[G_PAUSE]), 2),
+            "evidence": f"pause_count={pause} above baseline={b[G_PAUSE]:.1f}"})
+    if g[G_FILLER] >= 0:
+        indicators.append({"indicator": "filler_increase", "grade": round(float(g[G_FILLER]), 2),
+            "evidence": f"filler_count={filler} above baseline={b[G_FILLER]:.1f}"})
+    if g[G_WC] >= 0:
+        indicators.append({"indicator": "word_count_deviation", "grade": round(float(g[G_WC]), 2),
+            "evidence": f"word_count={wc} {'above' if wc > b[G_WC] else 'below'} baseline={b[G_WC]:.1f}"})
+    if g[G_AGREE] >= 0:
+        tok = text.lower().split()[0].strip('.,!?')
+        indicators.append({"indicator": "agreement_pattern", "grade": round(float(g[G_AGREE]), 2),
+            "evidence": f"word_count={wc} starts_with='{tok}' prev_word_count={prev_wc}"})
+    return indicators
+
+def transform(data: Dict) -> Dict:
+    sents, out = data.get('sentences', []), []
+    speech = [s.get('speech', {}) for s in sents]
+
+    # One record per sentence; the kernel reads each field as a strided column view.
+    # The agreement token is only looked up when the kernel's word-count guards could pass
+    rows, last_wc = [], 0
+    for s, sp in zip(sents, speech):
+        wc = sp.get('word_count',0)
+        agree = wc <= 3 and last_wc and last_wc >= wc * 2 and starts_with_agreement(s.get('text',''))
+        rows.append((wc, sp.get('confidence',0), sp.get('speed_wpm',0),
+                     sp.get('pause_count',0), sp.get('filler_count',0), bool(agree)))
+        last_wc = wc
+    rec = np.array(rows, dtype=MEASURE_DTYPE)
+    grades, bases, low_q = _score_sentences(rec['wc'], rec['conf'], rec['speed'], rec['pause'], rec['filler'], rec['agree'])
+    has_indicators = (grades >= 0).any(axis=1)
+
+    prev_wc = None
+    for idx, (s, sp) in enumerate(zip(sents, speech)):
+        wc, conf = sp.get('word_count',0), sp.get('confidence',0)
+        if low_q[idx]:
+            indicators = [{"indicator": "data_quality_issue", "grade": round(1-conf, 2),
+                           "evidence": f"avg_acoustic_confidence={conf:.3f} below {LOW_CONF}"}]
+        elif has_indicators[idx]:
+            indicators = build_indicators(sp, s.get('text',''), grades[idx], bases[idx], prev_wc)
+        else:
+            indicators = []
+
+        out.append({"sentence_index": idx, "timestamp": {"start": s.get('start',0), "end": s.get('end',0)},
+            "measurements": {"word_count": wc, "avg_acoustic_confidence": round(conf,3),
+                "speech_speed_wpm": sp.get('speed_wpm',0), "pause_count": sp.get('pause_count',0), 
+                "pause_duration": sp.get('pause_duration',0), "filler_count": sp.get('filler_count',0)},
+            "indicators": indicators})
+        prev_wc = wc
 
     return {"artifact_type": ARTIFACT_TYPE, "version": VERSION, "grade_formula": "|cur-base|/base, cap 1.0",
             "grade_threshold": GRADE_THRESHOLD, "baseline_method": f"rolling_avg(w={BASELINE_WINDOW},warmup={WARMUP})",
             "sentences": out}
 
+def loads(raw: bytes):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def dumps(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode() if orjson else json.dumps(obj, indent=2)
+
+def load_file(path: str):
+    """Parse a JSON file once, picking the codec from its BOM (PowerShell redirects write UTF-16)"""
+    with open(path, 'rb') as f: raw = f.read()
+    if raw[:3] == b'\xef\xbb\xbf': return loads(raw[3:])
+    if raw[:2] in (b'\xff\xfe', b'\xfe\xff'): return json.loads(raw.decode('utf-16'))
+    return loads(raw)
+
 def main():
     data = None
     if len(sys.argv) >= 2:
-        for enc in ['utf-8-sig', 'utf-8', 'utf-16']:
-            try:
-                with open(sys.argv[1], 'r', encoding=enc) as f: data = json.load(f); break
-            except: pass
-    else: data = json.load(sys.stdin)
-    print(json.dumps(transform(data) if data else {"error": "read_failed"}, indent=2))
+        try: data = load_file(sys.argv[1])
+        except: pass
+    else: data = loads(sys.stdin.buffer.read())
+    print(dumps(transform(data) if data else {"error": "read_failed"}))
 
 if __name__ == "__main__": main()
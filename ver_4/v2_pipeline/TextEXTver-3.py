@@ -2,8 +2,23 @@
 Extracts text markers (financial, product, commitment, regulatory, PII) using precise pattern matching.
 Rule-based, deterministic - no probabilistic NLP."""
 
-import json, re, sys
-from typing import Dict, List, Set
+import json, multiprocessing, os, pickle, re, sys, threading
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 VERSION, ARTIFACT_TYPE = "1.3.0", "text_marker_extraction"
 
@@ -18,65 +33,196 @@ REGULATORY = ["this call may be recorded","this call is being recorded","this ca
     "verify your identity","confirm your address","confirm your phone","for verification purposes",
     "terms and conditions","annual percentage rate","apr","cooling off period","rate of"]
 
+def _build_automaton():
+    """One Aho-Corasick automaton over all three keyword lists, so each sentence is
+    scanned once. Values carry (class, list rank, keyword) for picking the same winner
+    as the list-order / longest-phrase rules"""
+    entries = {}
+    for cls, kws in (("fin", FINANCIAL_KW), ("prod", PRODUCT_KW), ("reg", REGULATORY)):
+        for rank, kw in enumerate(kws):
+            entries.setdefault(kw, []).append((cls, rank, kw))
+    automaton = ahocorasick.Automaton()
+    for kw, values in entries.items():
+        automaton.add_word(kw, tuple(values))
+    automaton.make_automaton()
+    return automaton
+
+KEYWORDS = _build_automaton() if ahocorasick else None
+
+# Fallback regulatory matcher: one alternation, longest phrase first so each position
+# yields its longest phrase; the lookahead keeps overlapping candidates
+REGULATORY_RE = re.compile('(?=(' + '|'.join(re.escape(p) for p in sorted(REGULATORY, key=len, reverse=True)) + '))')
+REGULATORY_RANK = {p: i for i, p in enumerate(REGULATORY)}
+
 # Tighter currency regex - requires specific patterns, avoids false positives
 CURRENCY = re.compile(r'\$\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?|\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*(?:dollars?|USD|EUR|GBP|PLN|RUB)\b', re.I)
-COMMIT = [re.compile(p, re.I) for p in [r"\bi\s+will\s+pay\b",r"\bi'?ll\s+pay\b",r"\bi\s+agree\s+to\s+pay\b",
+# Single alternation: reports the earliest commitment in the text (earlier-listed phrase wins at a tie)
+COMMIT = re.compile('(?:' + '|'.join([r"\bi\s+will\s+pay\b",r"\bi'?ll\s+pay\b",r"\bi\s+agree\s+to\s+pay\b",
     r"\bi\s+can\s+pay\b",r"\blet\s+me\s+pay\b",r"\bi\s+authorize\b",r"\bi\s+agree\b",r"\byes,?\s+i\s+agree\b",
-    r"\bi\s+accept\b",r"\bi\s+consent\b",r"\bi\s+confirm\b",r"\blet'?s\s+use\s+(?:my|a)\s+(?:visa|card)\b"]]
+    r"\bi\s+accept\b",r"\bi\s+consent\b",r"\bi\s+confirm\b",r"\blet'?s\s+use\s+(?:my|a)\s+(?:visa|card)\b"]) + ')', re.I)
+
+# Tighter PII patterns - specific formats only (reduced false positives).
+# One pass over the text; the named group that matched is the category
+PII = re.compile(
+    r'(?P<phone>\b(?:\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|\(\d{3}\)\s*\d{3}[-.\s]?\d{4})\b)'  # Strict phone format
+    r'|(?P<account>\b\d{4}[-\s]\d{4}[-\s]\d{4}[-\s]\d{4}\b|\b\d{10,16}\b)'  # Card or account number
+    r'|(?P<ssn_partial>\b(?i:xxx)-(?i:xx)-\d{4}\b|\b\*{3}-\*{2}-\d{4}\b)')  # Masked SSN only
+
+def _build_prefilter():
+    """Hyperscan database over CURRENCY, COMMIT and PII. One vectorized scan tells which of
+    them can match a sentence; only those then run through re, which still produces the
+    actual matches. Hyperscan's word-boundary, space and digit classes are ASCII-only, so
+    it is only trusted on ASCII text"""
+    patterns = (CURRENCY, COMMIT, PII)
+    db = hyperscan.Database()
+    try:
+        db.compile(expressions=[p.pattern.encode() for p in patterns], ids=list(range(len(patterns))),
+                   flags=[hyperscan.HS_FLAG_SINGLEMATCH | (hyperscan.HS_FLAG_CASELESS if p.flags & re.I else 0)
+                          for p in patterns])
+    except hyperscan.error as e:
+        print(f"[WARN] Hyperscan prefilter unavailable: {e}", file=sys.stderr)
+        return None
+    return db
 
-# Tighter PII patterns - specific formats only (reduced false positives)
-PII = {
-    "phone": re.compile(r'\b(?:\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|\(\d{3}\)\s*\d{3}[-.\s]?\d{4})\b'),  # Strict phone format
-    "account": re.compile(r'\b\d{4}[-\s]\d{4}[-\s]\d{4}[-\s]\d{4}\b|\b\d{10,16}\b'),  # Card or account number
-    "ssn_partial": re.compile(r'\bxxx-xx-\d{4}\b|\b\*{3}-\*{2}-\d{4}\b', re.I)  # Masked SSN only
-}
+PREFILTER = _build_prefilter() if hyperscan else None
+
+# Every CURRENCY match contains '$' or one of these (case-insensitively)
+CURRENCY_WORDS = ("dollar", "usd", "eur", "gbp", "pln", "rub")
+
+def regex_candidates(text: str, tl: str) -> List[bool]:
+    """Which of (CURRENCY, COMMIT, PII) can match text (tl is text lower-cased)"""
+    if not text.isascii():
+        return [True, True, True]
+    if PREFILTER is None:
+        # Substring checks (C-level) rule the currency regex out for most sentences
+        return ['$' in text or any(w in tl for w in CURRENCY_WORDS), True, True]
+    hits = [False, False, False]
+    def on_match(pattern_id, start, end, flags, context):
+        hits[pattern_id] = True
+    PREFILTER.scan(text.encode(), match_event_handler=on_match)
+    return hits
+
+def match_keywords(tl: str, recent: Set[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(first FINANCIAL_KW hit, first PRODUCT_KW hit not in recent, longest REGULATORY hit) in lower-cased text"""
+    if KEYWORDS is None:
+        fin = next((kw for kw in FINANCIAL_KW if kw in tl), None)
+        product = None
+        for kw in PRODUCT_KW:
+            if kw in tl:
+                if kw in recent: continue
+                product = kw; break
+        reg = max((m.group(1) for m in REGULATORY_RE.finditer(tl)), default=None,
+                  key=lambda p: (len(p), -REGULATORY_RANK[p]))
+        return fin, product, reg
+    fin = product = reg = None
+    for _, values in KEYWORDS.iter(tl):
+        for cls, rank, kw in values:
+            if cls == "fin":
+                if fin is None or rank < fin[0]: fin = (rank, kw)
+            elif cls == "prod":
+                if kw not in recent and (product is None or rank < product[0]): product = (rank, kw)
+            elif reg is None or len(kw) > len(reg[1]) or (len(kw) == len(reg[1]) and rank < reg[0]):
+                reg = (rank, kw)
+    return fin and fin[1], product and product[1], reg and reg[1]
 
 def extract(text: str, recent: Set[str]) -> tuple:
     markers, tl = [], text.lower()
-    for m in CURRENCY.finditer(text):
-        markers.append({"type":"financial_entity","category":"currency_amount","matched_text":m.group(),"evidence":f"'{m.group()}'"})
-    for kw in FINANCIAL_KW:
-        if kw in tl: markers.append({"type":"financial_entity","category":"financial_term","matched_text":kw,"evidence":f"'{kw}'"}); break
-    product = None
-    for kw in PRODUCT_KW:
-        if kw in tl and kw not in recent: markers.append({"type":"product_reference","matched_text":kw,"evidence":f"'{kw}'"}); product=kw; break
-    for p in COMMIT:
-        m = p.search(text)
-        if m: markers.append({"type":"customer_commitment","matched_text":m.group(),"evidence":f"'{m.group()}'"}); break
-    reg_matches = [(p, len(p)) for p in REGULATORY if p in tl]
-    if reg_matches:
-        best = max(reg_matches, key=lambda x: x[1])[0]
-        markers.append({"type":"regulatory_prompt","matched_phrase":best,"evidence":f"'{best}'"})
-    flagged = set()
-    for cat, pat in PII.items():
-        for m in pat.finditer(text):
-            if m.start() not in flagged and (cat != "sequence" or len(m.group()) >= 5):
-                markers.append({"type":"potential_pii","category":cat+"_pattern" if cat!="sequence" else "numeric_sequence",
-                    "position":m.start(),"length":len(m.group()),"evidence":f"at pos {m.start()}"})
-                flagged.add(m.start())
+    add = markers.append
+    has_currency, has_commit, has_pii = regex_candidates(text, tl)
+    for m in CURRENCY.finditer(text) if has_currency else ():
+        g = m.group()
+        add({"type":"financial_entity","category":"currency_amount","matched_text":g,"evidence":f"'{g}'"})
+    fin, product, reg = match_keywords(tl, recent)
+    if fin: add({"type":"financial_entity","category":"financial_term","matched_text":fin,"evidence":f"'{fin}'"})
+    if product: add({"type":"product_reference","matched_text":product,"evidence":f"'{product}'"})
+    m = COMMIT.search(text) if has_commit else None
+    if m:
+        g = m.group()
+        add({"type":"customer_commitment","matched_text":g,"evidence":f"'{g}'"})
+    if reg:
+        add({"type":"regulatory_prompt","matched_phrase":reg,"evidence":f"'{reg}'"})
+    for m in PII.finditer(text) if has_pii else ():
+        start = m.start()
+        add({"type":"potential_pii","category":m.lastgroup+"_pattern",
+            "position":start,"length":m.end()-start,"evidence":f"at pos {start}"})
     return markers, {product} if product else set()
 
-def transform(data: Dict) -> Dict:
-    sents, out, recent = data.get('sentences', []), [], set()
-    for idx, s in enumerate(sents):
-        text = s.get('text', '')
-        markers, products = extract(text, recent)
-        recent = products
+# Transcripts longer than this are extracted in PARALLEL_CHUNK-sentence chunks on a process pool.
+# A sentence costs ~50us, so below ~1000 the pool's fork and result pickling outweigh the split
+PARALLEL_MIN_SENTENCES, PARALLEL_CHUNK = 1000, 256
+
+def _extract_chunk(texts: List[str]) -> List[tuple]:
+    """Extract without the cross-sentence product suppression: per sentence, the markers
+    plus the first product keyword and the one that would replace it if suppressed"""
+    results = []
+    for text in texts:
+        markers, products = extract(text, set())
+        first = next(iter(products), None)
+        results.append((markers, first, match_keywords(text.lower(), {first})[1] if first else None))
+    return results
+
+def _extract_all(texts: List[str], parallel: bool) -> List[tuple]:
+    # fork only: spawn-based platforms can't re-import this hyphenated script by name.
+    # Forking a process that already runs other threads (the pipeline's Backboard loop,
+    # torch/CTranslate2 pools) can deadlock the child on a lock held at fork time, so
+    # the pool is only used when the caller asks for it and no other thread is running
+    workers = min(-(-len(texts) // PARALLEL_CHUNK), os.cpu_count() or 1)
+    if (parallel and len(texts) > PARALLEL_MIN_SENTENCES and workers > 1 and threading.active_count() == 1
+            and "fork" in multiprocessing.get_all_start_methods()):
+        chunks = [texts[i:i + PARALLEL_CHUNK] for i in range(0, len(texts), PARALLEL_CHUNK)]
+        try:
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                return [r for chunk in pool.map(_extract_chunk, chunks) for r in chunk]
+        except (OSError, pickle.PicklingError, AttributeError) as e:
+            print(f"[WARN] Parallel extraction unavailable, running serially: {e}", file=sys.stderr)
+    return _extract_chunk(texts)
+
+def transform(data: Dict, parallel: bool = False) -> Dict:
+    """parallel=True allows a forked process pool for long transcripts; only the
+    standalone CLI sets it, in-process callers (the v2 pipeline) stay single-process"""
+    sents, out, recent = data.get('sentences', []), [], None
+    texts = [s.get('text', '') for s in sents]
+    for idx, (s, text, (markers, product, fallback)) in enumerate(zip(sents, texts, _extract_all(texts, parallel))):
+        # Re-apply the one-sentence repeat suppression in order
+        if product is not None and product == recent:
+            pos = next(i for i, m in enumerate(markers) if m["type"] == "product_reference")
+            if fallback:
+                markers[pos] = {"type":"product_reference","matched_text":fallback,"evidence":f"'{fallback}'"}
+            else:
+                del markers[pos]
+            product = fallback
+        recent = product
         out.append({"sentence_index":idx,"timestamp":{"start":s.get('start',0),"end":s.get('end',0)},"text":text,"markers":markers})
     return {"artifact_type":ARTIFACT_TYPE,"version":VERSION,"marker_types":["financial_entity","product_reference",
         "customer_commitment","regulatory_prompt","potential_pii"],"extraction_method":"deterministic_pattern_matching","sentences":out}
 
+def load_json_bytes(raw: bytes):
+    """Parse JSON bytes, picking the codec from the BOM (PowerShell redirects write UTF-16)"""
+    if raw[:3] == b'\xef\xbb\xbf': raw = raw[3:]
+    elif raw[:2] in (b'\xff\xfe', b'\xfe\xff'): return json.loads(raw.decode('utf-16'))
+    if orjson:
+        try: return orjson.loads(raw)
+        except ValueError: pass  # BOM-less UTF-16 or stray non-UTF-8 bytes: left to the stdlib
+    try: return json.loads(raw)
+    except UnicodeDecodeError: return json.loads(raw.decode('utf-8', errors='replace'))
+
+def emit(obj) -> None:
+    """Write obj to stdout as indented JSON; orjson's UTF-8 bytes go straight to the buffer"""
+    if orjson:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n")
+        sys.stdout.flush()
+    else:
+        print(json.dumps(obj, indent=2))
+
 def main():
     data = None
     if len(sys.argv) >= 2:
-        for enc in ['utf-8-sig', 'utf-8', 'utf-16']:
-            try:
-                with open(sys.argv[1], 'r', encoding=enc) as f:
-                    data = json.load(f)
-                    break
-            except:
-                pass
-    else: data = json.load(sys.stdin)
-    print(json.dumps(transform(data) if data else {"error":"read_failed"}, indent=2))
+        try:
+            with open(sys.argv[1], 'rb') as f: data = load_json_bytes(f.read())
+        except (OSError, ValueError):
+            pass
+    else: data = load_json_bytes(sys.stdin.buffer.read())
+    emit(transform(data, parallel=True) if data else {"error":"read_failed"})
 
 if __name__ == "__main__": main()
@@ -7,12 +7,30 @@ preserves all timestamps, confidence scores, and metrics unchanged.
 
 Pipeline: VtoT(3).py → vtot_output.json → Translate.py → vtot_output_en.json
 
-OPTIMIZED: Uses chunked batch translation (~20 sentences per API call)
+OPTIMIZED: Uses chunked batch translation (sentences packed up to a length budget per API call)
 """
+import contextlib
+import hashlib
 import json
+import operator
+import re
+import sqlite3
 import sys
 import os
-from typing import Dict, List
+import tempfile
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
 
 # Use Backboard for high-accuracy LLM translation
 from BackboardClient import BackboardWrapper
@@ -27,64 +45,282 @@ LANG_FULL_NAMES = {
     'uk': 'Ukrainian', 'vi': 'Vietnamese', 'th': 'Thai', 'id': 'Indonesian'
 }
 
+# ASCII bytes that are not letters, deleted by bytes.translate to count letters in C
+_ASCII_NON_ALPHA = bytes(c for c in range(128) if not chr(c).isalpha())
+
 def looks_like_gibberish(text: str) -> bool:
-    """Returns True if text is empty or alphabetic ratio is below 0.6."""
+    """Returns True if text is empty or alphabetic ratio is below 0.6.
+    Outside ASCII, letters are Unicode categories L* and M*: Devanagari/Thai vowel
+    signs and other combining marks are part of words but not str.isalpha()."""
     if not text: return True
-    alpha_chars = sum(1 for c in text if c.isalpha())
+    if text.isascii():
+        alpha_chars = len(text.encode('ascii').translate(None, _ASCII_NON_ALPHA))
+    else:
+        alpha_chars = sum(unicodedata.category(c)[0] in 'LM' for c in text)
     return (alpha_chars / len(text)) < 0.6
 
+# Scripts written without spaces between words (Thai, Lao, Myanmar, Khmer, kana, CJK),
+# where a whole sentence splits into a single token
+_UNSPACED_SCRIPT = re.compile('[\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+def is_translatable(text: str) -> bool:
+    """Worth a batch slot: at least two words (two characters in unspaced scripts)
+    and not gibberish. Mostly numeric or symbolic text ("$3.5 million", "2024 Q3")
+    reads the same in English and fails the alphabetic-ratio check, so it is never sent."""
+    if len(text.split()) < 2 and not (len(text.strip()) >= 2 and _UNSPACED_SCRIPT.search(text)):
+        return False
+    return not looks_like_gibberish(text)
+
+# Common English function words that don't double as everyday words in the other
+# supported Latin-script languages (so no "a", "in", "to", "is", "me", nor Dutch
+# "we"/"of"/"was", German "will"/"not", Polish/Czech "my", Swedish "from")
+_ENGLISH_MARKERS = frozenset({'the','and','you','your','that','this','with','are','have',
+                              'what','for','it','our','they','would','about','there',
+                              'which','their'})
+
+def looks_english(text: str) -> bool:
+    """Heuristic for English stretches inside a non-English call: (almost) all ASCII
+    and at least two distinct English function words."""
+    if len(text.encode('ascii', 'ignore')) <= 0.95 * len(text):
+        return False
+    return len(_ENGLISH_MARKERS.intersection(w.strip('.,!?;:"\'') for w in text.lower().split())) >= 2
+
 def apply_financial_corrections(text: str) -> str:
     # LLM usually handles this, kept for deterministic safety.
     return text
 
-BATCH_SIZE = 15 # LLM batches can be smaller for stability
-SEPARATOR = " [[[SPLIT]]] "
+# Batches grow until either limit is hit: short sentences share one call's prompt
+# overhead, long ones stay well inside the model's context
+MAX_BATCH_CHARS, MAX_BATCH_ROWS = 6000, 40
+# A "###" line between segments: a few tokens per boundary where " [[[SPLIT]]] " took
+# several more. Replies are split leniently in case the model pads it with blank lines
+SEPARATOR = "\n###\n"
+SEPARATOR_RE = re.compile(r'\s*\n\s*###\s*\n\s*')
+
+def pack_batches(texts: List[str], max_chars: int = MAX_BATCH_CHARS, max_rows: int = MAX_BATCH_ROWS) -> List[Tuple[int, int]]:
+    """Greedily split texts into contiguous (start, end) ranges whose joined length
+    (texts plus separators) stays within max_chars. A text longer than max_chars
+    gets a batch of its own."""
+    ranges, start, size = [], 0, 0
+    for i, text in enumerate(texts):
+        if i > start and (i - start >= max_rows or size + len(SEPARATOR) + len(text) > max_chars):
+            ranges.append((start, i))
+            start, size = i, 0
+        size += len(text) + (len(SEPARATOR) if i > start else 0)
+    if start < len(texts):
+        ranges.append((start, len(texts)))
+    return ranges
+
+# Fixed instructions live in the assistant's system prompt, so each batch message
+# carries only the source language and the segments
+TRANSLATOR_INSTRUCTIONS = """You are a professional financial translator.
+Each message starts with a "SRC=<language>" line; translate the segments that follow from that language to English.
+Segments are separated by a line containing only ###. Maintain the exact structure and keep one such line between segments.
+Diarization markers or special terms should be preserved in their English equivalents.
+Respond ONLY with the translated segments, separated by ### lines. No explanations."""
 
-def llm_translate(texts: List[str], src_lang_code: str, client: BackboardWrapper) -> List[str]:
-    """Translate a batch of texts using Backboard LLM."""
-    if not texts: return []
+_PROMPT_TEMPLATE = "SRC={src}\n{body}"
+_SEPARATOR_NEWLINES = SEPARATOR.count('\n')
+
+def build_translation_prompt(texts: List[str], src_lang: str) -> str:
+    """Batch message: the SRC line naming src_lang (full name), then the segments joined by SEPARATOR.
+    Line breaks inside a segment are flattened so no segment can look like a separator."""
+    body = SEPARATOR.join(texts)
+    # Transcript segments rarely contain newlines; only then is each text rewritten
+    if body.count('\n') != _SEPARATOR_NEWLINES * (len(texts) - 1):
+        body = SEPARATOR.join([t.replace('\n', ' ') for t in texts])
+    return _PROMPT_TEMPLATE.format(src=src_lang, body=body)
+
+
+# Sentence translations keyed by model + language + text, reused across runs. SQLite
+# lets a run read just its own keys and add new ones without rewriting the whole
+# store; set VTOT_TRANSLATE_CACHE="" to disable
+TRANSLATE_CACHE = os.path.expanduser(os.environ.get("VTOT_TRANSLATE_CACHE", "~/.cache/vtot_translate.sqlite3"))
+_SQLITE_MAX_PARAMS = 500
+
+def _cache_key(src_lang_code: str, text: str) -> str:
+    return hashlib.sha1(f"{DEFAULT_MODEL}\0{src_lang_code}\0{text}".encode('utf-8')).hexdigest()
+
+def _open_cache() -> Optional[sqlite3.Connection]:
+    if not TRANSLATE_CACHE:
+        return None
+    try:
+        os.makedirs(os.path.dirname(TRANSLATE_CACHE) or '.', exist_ok=True)
+        conn = sqlite3.connect(TRANSLATE_CACHE, timeout=30)
+        conn.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARN] Translation cache unavailable {TRANSLATE_CACHE}: {e}", file=sys.stderr)
+        return None
+
+def load_cached_translations(keys: List[str]) -> Dict[str, str]:
+    """Cached translation for each of keys that has one."""
+    conn = _open_cache()
+    if conn is None:
+        return {}
+    found = {}
+    try:
+        with contextlib.closing(conn):
+            for i in range(0, len(keys), _SQLITE_MAX_PARAMS):
+                chunk = keys[i:i + _SQLITE_MAX_PARAMS]
+                found.update(conn.execute(
+                    f"SELECT key, text FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+    except sqlite3.Error as e:
+        print(f"[WARN] Could not read translation cache {TRANSLATE_CACHE}: {e}", file=sys.stderr)
+    return found
+
+def save_cached_translations(entries: Dict[str, str]) -> None:
+    if not entries:
+        return
+    conn = _open_cache()
+    if conn is None:
+        return
+    try:
+        with contextlib.closing(conn), conn:
+            conn.executemany("INSERT OR REPLACE INTO translations (key, text) VALUES (?, ?)", entries.items())
+    except sqlite3.Error as e:
+        print(f"[WARN] Could not write translation cache {TRANSLATE_CACHE}: {e}", file=sys.stderr)
+
+
+def split_translation(response: Dict, count: int) -> Optional[List[str]]:
+    """Split a send_message-style response into count translations, or None if the call
+    failed or the reply doesn't have exactly one segment per text."""
+    if not response.get("success"):
+        print(f"[WARN] LLM Translation failed: {response.get('error')}", file=sys.stderr)
+        return None
+    result = SEPARATOR_RE.split(str(response["response"]).strip())
+    if count == 1:
+        # A single text has nothing to misalign; a stray separator is just joined over
+        return [' '.join(r.strip() for r in result)]
+    if len(result) != count:
+        print(f"[WARN] LLM Translation returned {len(result)} segments for {count}", file=sys.stderr)
+        return None
+    return [r.strip() for r in result]
+
+
+def translate_batches(client: BackboardWrapper, batches: List[List[str]], src_lang_code: str) -> List[List[Optional[str]]]:
+    """Translate batches of texts concurrently, one translation per text.
+    
+    A batch whose call fails or whose reply doesn't split into one segment per text
+    is halved and both halves are retried, down to single texts, so one misformatted
+    reply doesn't cost the whole batch. Texts that still fail come back as None.
+    """
+    src_lang = LANG_FULL_NAMES.get(src_lang_code, src_lang_code)  # resolved once for every batch and retry
+    results: List[List[Optional[str]]] = [[None] * len(b) for b in batches]
+    work = [(i, 0, b) for i, b in enumerate(batches) if b]  # (batch, offset, texts) to send
+    while work:
+        done, total = 0, len(work)
+
+        def report(k: int, _result: Dict) -> None:
+            nonlocal done
+            done += 1
+            print(f"[INFO] Batch {k+1} done ({done}/{total} batches)", file=sys.stderr)
+
+        try:
+            responses = client.send_messages_bulk(
+                [build_translation_prompt(texts, src_lang) for _, _, texts in work], on_done=report)
+        except Exception as e:
+            print(f"[WARN] LLM Translation error: {e}", file=sys.stderr)
+            break
+        retry = []
+        for (i, offset, texts), response in zip(work, responses):
+            translated = split_translation(response, len(texts))
+            if translated is not None:
+                results[i][offset:offset + len(texts)] = translated
+            elif len(texts) > 1:
+                half = len(texts) // 2
+                retry += [(i, offset, texts[:half]), (i, offset + half, texts[half:])]
+        if retry:
+            print(f"[INFO] Retrying {len(retry)} half-batches", file=sys.stderr)
+        work = retry
+    return results
+
+
+# OpenAI Batch API polling: first wait, then doubling up to the cap
+OFFLINE_POLL_START, OFFLINE_POLL_MAX = 30, 600
+OFFLINE_DONE = ("completed", "failed", "expired", "cancelled")
+
+def offline_translate_batches(batches: List[List[str]], src_lang_code: str) -> List[List[Optional[str]]]:
+    """Translate batches through the OpenAI Batch API (about half the cost, results within
+    24h) instead of live Backboard calls. For bulk reprocessing of stored transcripts.
     
+    Uploads one chat-completion request per batch as JSONL, polls the job with exponential
+    backoff and splits each reply back per text. Texts whose request failed come back as
+    None. Needs the openai package and OPENAI_API_KEY.
+    """
+    if openai is None:
+        raise ImportError("openai not installed. Run: pip install openai")
+    client = openai.OpenAI()
     src_lang = LANG_FULL_NAMES.get(src_lang_code, src_lang_code)
-    combined = SEPARATOR.join(texts)
     
-    prompt = f"""You are a professional financial translator. 
-Translate the following segments from {src_lang} to English.
-Maintain the exact structure and keep the separator "{SEPARATOR}" between segments.
-Diarization markers or special terms should be preserved in their English equivalents.
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', encoding='utf-8', delete=False) as f:
+        for i, texts in enumerate(batches):
+            f.write(json.dumps({
+                "custom_id": str(i), "method": "POST", "url": "/v1/chat/completions",
+                "body": {"model": DEFAULT_MODEL, "messages": [
+                    {"role": "system", "content": TRANSLATOR_INSTRUCTIONS},
+                    {"role": "user", "content": build_translation_prompt(texts, src_lang)}]}
+            }, ensure_ascii=False) + "\n")
+    try:
+        with open(f.name, 'rb') as upload:
+            input_file = client.files.create(file=upload, purpose="batch")
+    finally:
+        os.remove(f.name)
+    job = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions",
+                                completion_window="24h")
+    print(f"[INFO] Submitted offline batch {job.id} ({len(batches)} requests)", file=sys.stderr)
+    
+    delay = OFFLINE_POLL_START
+    while job.status not in OFFLINE_DONE:
+        time.sleep(delay)
+        delay = min(delay * 2, OFFLINE_POLL_MAX)
+        job = client.batches.retrieve(job.id)
+        print(f"[INFO] Offline batch {job.id}: {job.status}", file=sys.stderr)
+    
+    results: List[List[Optional[str]]] = [[None] * len(b) for b in batches]
+    if not job.output_file_id:
+        print(f"[WARN] Offline batch {job.id} ended {job.status} without output", file=sys.stderr)
+        return results
+    for line in client.files.content(job.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        i = int(record["custom_id"])
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            print(f"[WARN] Offline request {i} failed: {record.get('error')}", file=sys.stderr)
+            continue
+        reply = response["body"]["choices"][0]["message"]["content"]
+        translated = split_translation({"success": True, "response": reply}, len(batches[i]))
+        if translated is not None:
+            results[i] = translated
+    return results
+
+
+def send_batches(batches: List[List[str]], src_lang_code: str, batch_mode: str = "online") -> List[List[Optional[str]]]:
+    """Translate batches live through Backboard, or via the OpenAI Batch API when offline."""
+    if batch_mode == "offline":
+        return offline_translate_batches(batches, src_lang_code)
+    client = BackboardWrapper(api_key=TRANSLATION_API_KEY, model=DEFAULT_MODEL)
+    client.create_assistant(name="TranslationAssistant", system_prompt=TRANSLATOR_INSTRUCTIONS)
+    return translate_batches(client, batches, src_lang_code)
 
-Segments to translate:
-{combined}
 
-Respond ONLY with the translated segments, separated by "{SEPARATOR}". No explanations."""
+def llm_translate(texts: List[str], src_lang_code: str, client: BackboardWrapper) -> List[str]:
+    """Translate a batch of texts using Backboard LLM (originals where translation failed)."""
+    if not texts: return []
+    translated = translate_batches(client, [texts], src_lang_code)[0]
+    return [orig if trans is None else trans for orig, trans in zip(texts, translated)]
 
-    try:
-        response = client.send_message(prompt)
-        if response.get("success"):
-            translated = response["response"]
-            result = translated.split(SEPARATOR)
-            
-            # Pad or trim to match input size
-            if len(result) < len(texts):
-                result.extend(texts[len(result):])
-            return [r.strip() for r in result[:len(texts)]]
-        else:
-            print(f"[WARN] LLM Translation failed: {response.get('error')}", file=sys.stderr)
-            return texts
-    except Exception as e:
-        print(f"[WARN] LLM Translation error: {e}", file=sys.stderr)
-        return texts
-
-
-def translate_transcript(input_file: str, output_file: str) -> Dict:
+
+def translate_data(data: Dict, batch_mode: str = "online") -> Dict:
     """
-    Translate VtoT output JSON to English using CHUNKED BATCH translation.
+    Translate a VtoT result dict to English in place using CHUNKED BATCH translation.
     Preserves all metadata, timestamps, and metrics.
+    
+    batch_mode="offline" sends the batches through the OpenAI Batch API
+    (see offline_translate_batches) instead of live Backboard calls.
     """
-    print(f"[INFO] Reading: {input_file}", file=sys.stderr)
-
-    with open(input_file, 'r', encoding='utf-8-sig') as f:
-        data = json.load(f)
-
     # Get detected language
     whisper_data = data.get('whisper', {})
     detected_lang = whisper_data.get('language', 'en')
@@ -104,120 +340,170 @@ def translate_transcript(input_file: str, output_file: str) -> Dict:
             'translated': False,
             'translator': None
         }
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
         return data
 
-    # Setup translator
-    client = BackboardWrapper(api_key=TRANSLATION_API_KEY, model=DEFAULT_MODEL)
-    client.create_assistant(name="TranslationAssistant", system_prompt="You are a professional financial translator.")
-
-    # Translate main text
-    original_text = whisper_data.get('text', '')
-    try:
-        if original_text:
-            response = client.send_message(f"Translate this text to English from {LANG_FULL_NAMES.get(detected_lang, detected_lang)}: {original_text}")
-            if response.get("success"):
-                whisper_data['text'] = response["response"]
-                whisper_data['original_text'] = original_text
-    except Exception as e:
-        print(f"[WARN] Main text translation failed: {e}", file=sys.stderr)
-
     # CHUNKED BATCH TRANSLATION
     sentences = data.get('sentences', [])
     total = len(sentences)
     
-    # Calculate average sentence length in words
-    avg_length = 0
-    if total > 0:
-        total_words = sum(len(s.get('text', '').split()) for s in sentences)
-        avg_length = total_words / total
+    # Store original texts and calculate average sentence length in words, in one pass
+    original_texts, total_words = [], 0
+    for s in sentences:
+        text = s.get('text', '')
+        original_texts.append(text)
+        total_words += len(text.split())
+    avg_length = total_words / total if total > 0 else 0
     
     sentence_translation_enabled = avg_length >= 3
-    num_batches = (total + BATCH_SIZE - 1) // BATCH_SIZE
+
+    # Each distinct text is translated once; repeats and earlier runs' translations
+    # come from the cache. Gibberish, single-word and already-English texts are not
+    # sent at all and keep their original text
+    translations: Dict[str, str] = {}
+    pending, ranges = [], []
+    if sentence_translation_enabled:
+        keys = {text: _cache_key(detected_lang, text)
+                for text in dict.fromkeys(t for t in original_texts if is_translatable(t) and not looks_english(t))}
+        cache = load_cached_translations(list(keys.values()))
+        for text, key in keys.items():
+            cached = cache.get(key)
+            if cached is None:
+                pending.append(text)
+            else:
+                translations[text] = cached
+        # Similar-length texts share a batch, so replies in a round finish close together;
+        # results map back through the translations dict, so no unsorting is needed
+        pending.sort(key=len)
+        ranges = pack_batches(pending)
+    num_batches = len(ranges)
 
     if sentence_translation_enabled:
-        print(f"[INFO] Translating {total} sentences via {DEFAULT_MODEL} in {num_batches} batches... (Avg length: {avg_length:.1f})", file=sys.stderr)
+        print(f"[INFO] Translating {total} sentences ({len(pending)} distinct uncached) via {DEFAULT_MODEL} in {num_batches} batches... (Avg length: {avg_length:.1f})", file=sys.stderr)
     else:
         print(f"[INFO] Skipping sentence-level translation. Avg length ({avg_length:.1f}) below threshold.", file=sys.stderr)
 
     translated_count = 0
     skipped_count = 0
+    full_text_translated = False
+
+    # Process in batches. Batches are independent, so they are sent concurrently
+    # (each on its own thread) and written back in order
+    if sentence_translation_enabled and ranges:
+        batches = [pending[start:end] for start, end in ranges]
+        batch_results = send_batches(batches, detected_lang, batch_mode)
+        new_entries = {}
+        for batch_originals, batch_translated in zip(batches, batch_results):
+            # Texts that failed keep their original; only real translations are cached
+            for orig, trans in zip(batch_originals, batch_translated):
+                if trans is not None:
+                    translations[orig] = trans
+                    new_entries[keys[orig]] = trans
+        save_cached_translations(new_entries)
 
-    # Store original texts
-    original_texts = [s.get('text', '') for s in sentences]
-
-    # Process in batches
     if sentence_translation_enabled:
-        for batch_idx in range(num_batches):
-            start = batch_idx * BATCH_SIZE
-            end = min(start + BATCH_SIZE, total)
-
-            batch_originals = original_texts[start:end]
-            batch_translated = llm_translate(batch_originals, detected_lang, client)
-
-            # Update sentences
-            for i, (orig, trans) in enumerate(zip(batch_originals, batch_translated)):
-                idx = start + i
-                sentences[idx]['original_text'] = orig
-                sentences[idx]['text'] = trans
-
-                if trans == orig:
-                    sentences[idx]['translation_skipped'] = True
-                    skipped_count += 1
-                else:
-                    translated_count += 1
-
-            print(f"[INFO] Batch {batch_idx+1}/{num_batches} done ({end}/{total})", file=sys.stderr)
+        # Translated text as a column parallel to original_texts; counts and the
+        # full text come from the two lists, the sentence dicts are only written
+        translated_texts = [translations.get(t, t) for t in original_texts]
+        translated_count = sum(map(operator.ne, translated_texts, original_texts))
+        skipped_count = total - translated_count
+
+        # Update sentences
+        for s, orig, trans in zip(sentences, original_texts, translated_texts):
+            s['original_text'] = orig
+            s['text'] = trans
+            if trans == orig:
+                s['translation_skipped'] = True
+
+        # The full text is the sentences joined, so it is rebuilt from their
+        # translations rather than translated again as one large message
+        if translated_count:
+            whisper_data['original_text'] = whisper_data.get('text', '')
+            whisper_data['text'] = ' '.join(filter(None, translated_texts))
     else:
         # Mark all as skipped
         for s in sentences:
             s['translation_skipped'] = True
             skipped_count += 1
 
+        # Sentences too short to translate one by one (typical of scripts written without
+        # spaces): the full text still goes out, as a single one-segment batch
+        full_text = whisper_data.get('text', '')
+        if is_translatable(full_text) and not looks_english(full_text):
+            num_batches = 1
+            [[translated_text]] = send_batches([[full_text]], detected_lang, batch_mode)
+            if translated_text is not None:
+                whisper_data['original_text'] = full_text
+                whisper_data['text'] = translated_text
+                full_text_translated = True
+
     # Add translation metadata
     data['translation'] = {
         'source_language': detected_lang,
         'target_language': 'en',
-        'translated': True,
-        'translator': f"Backboard ({DEFAULT_MODEL})",
+        'translated': translated_count > 0 or full_text_translated,
+        'translator': f"OpenAI Batch ({DEFAULT_MODEL})" if batch_mode == "offline" else f"Backboard ({DEFAULT_MODEL})",
         'batch_mode': True,
-        'batch_size': BATCH_SIZE,
+        'max_batch_rows': MAX_BATCH_ROWS,
+        'max_batch_chars': MAX_BATCH_CHARS,
         'num_batches': num_batches,
         'sentences_translated': translated_count,
         'sentences_skipped': skipped_count
     }
 
-    # Write output
-    print(f"[INFO] Writing: {output_file}", file=sys.stderr)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
     print(f"[OK] Translation complete: {translated_count} translated, {skipped_count} skipped", file=sys.stderr)
 
     return data
 
 
+def load_json(path: str):
+    """Parse a JSON file read as bytes once, skipping a UTF-8 BOM"""
+    with open(path, 'rb') as f: raw = f.read()
+    if raw[:3] == b'\xef\xbb\xbf': raw = raw[3:]
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def translate_transcript(input_file: str, output_file: str, batch_mode: str = "online") -> Dict:
+    """Translate a VtoT output JSON file and write the English version to output_file."""
+    print(f"[INFO] Reading: {input_file}", file=sys.stderr)
+    data = load_json(input_file)
+
+    data = translate_data(data, batch_mode)
+
+    print(f"[INFO] Writing: {output_file}", file=sys.stderr)
+    # Compact: the next stage reads this file, not a person
+    if orjson:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    return data
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python Translate.py <input.json> [output.json]")
+    args = [a for a in sys.argv[1:] if a != "--batch-offline"]
+    batch_mode = "offline" if len(args) < len(sys.argv) - 1 else "online"
+    if len(args) < 1:
+        print("Usage: python Translate.py [--batch-offline] <input.json> [output.json]")
         print("       If output not specified, creates <input>_en.json")
+        print("       --batch-offline: translate via the OpenAI Batch API (cheaper, may take hours)")
         sys.exit(1)
 
-    input_file = sys.argv[1]
+    input_file = args[0]
 
     if not os.path.exists(input_file):
         print(f"[ERROR] File not found: {input_file}", file=sys.stderr)
         sys.exit(1)
 
     # Generate output filename
-    if len(sys.argv) >= 3:
-        output_file = sys.argv[2]
+    if len(args) >= 2:
+        output_file = args[1]
     else:
         base, ext = os.path.splitext(input_file)
         output_file = f"{base}_en{ext}"
 
-    result = translate_transcript(input_file, output_file)
+    result = translate_transcript(input_file, output_file, batch_mode)
 
     # Print summary to stdout
     print(json.dumps({
@@ -2,16 +2,17 @@
 Whisper: meaning (text, sentences). VOSK: speech behavior (timing, confidence, pauses, speed, fillers).
 Pyannote: speaker diarization (speaker_id per segment)."""
 
-import json, os, sys, subprocess, tempfile, wave
+import bisect, contextlib, functools, json, os, sys, subprocess, hashlib, socket, socketserver, tempfile, traceback
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
 try:
-    import whisper
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
     from vosk import Model, KaldiRecognizer, SetLogLevel
     # Use configuration-driven Whisper settings
-    from config import WHISPER_MODEL, WHISPER_LANGUAGE, WHISPER_TASK, WHISPER_DEVICE
+    from config import WHISPER_MODEL, WHISPER_LANGUAGE, WHISPER_TASK, WHISPER_DEVICE, PYANNOTE_MODEL
 except ImportError as e:
     print(json.dumps({"whisper":{"text":"","language":None,"sentence_count":0},"sentences":[],"status":"ERROR","reason":str(e)}))
     sys.exit(1)
@@ -24,49 +25,155 @@ try:
 except ImportError:
     print("[WARN] pyannote.audio not available, diarization disabled", file=sys.stderr)
 
-FILLERS = {'uh','um','er','ah','like','you know','basically','actually'}
+# VOSK emits one token per word, so multi-word fillers are matched as adjacent pairs
+UNIGRAM_FILLERS = {'uh','um','er','ah','like','basically','actually'}
+BIGRAM_FILLERS = {('you','know')}
 
 HF_TOKEN = os.environ.get("HF_TOKEN", None)
 
+# Silence-delimited chunks encoded/decoded together per Whisper forward pass
+WHISPER_BATCH_SIZE = 16
+
+# Cores for the concurrent stages: VOSK decodes on one, Whisper (CTranslate2) and
+# pyannote (torch) split the rest instead of each sizing its pool to every core
+CPU_CORES = os.cpu_count() or 1
+DIARIZATION_THREADS = max(1, (CPU_CORES - 1) // 2)
+
+# Samples per AcceptWaveform call (1s at 16 kHz); fewer, larger calls into Kaldi
+VOSK_CHUNK_SAMPLES = 16000
+
+# Decodes longer than this spill to an anonymous temp file and are memory-mapped,
+# so hour-long calls don't pin their int16 + float32 copies in RAM
+MEMMAP_SECONDS = float(os.environ.get("VTOT_MEMMAP_SECONDS", 600))
+
+# Warm-model daemon (`--serve`): clients send one JSON request per line and get one JSON result line
+VTOT_SOCKET = os.environ.get("VTOT_SOCKET", os.path.join(tempfile.gettempdir(), "vtot.sock"))
+
+# Stage results keyed by decoded-audio hash + model; set VTOT_CACHE_DIR="" to disable
+CACHE_DIR = os.path.expanduser(os.environ.get("VTOT_CACHE_DIR", "~/.vtot_cache"))
+
+class _ActiveMaskEmbedding:
+    """Wraps pyannote's speaker-embedding model so (chunk, speaker) pairs whose mask
+    is all zero never reach it. pyannote returns NaN for those pairs anyway; on
+    half-silent call audio that's most of the embedding batch"""
+
+    def __init__(self, embedding):
+        self._embedding = embedding
+
+    def __getattr__(self, name):
+        return getattr(self._embedding, name)
+
+    def __call__(self, waveforms, masks=None):
+        if masks is None:
+            return self._embedding(waveforms)
+        active = (masks.reshape(len(masks), -1) > 0).any(dim=1)
+        if bool(active.all()):
+            return self._embedding(waveforms, masks=masks)
+        out = np.full((len(masks), self._embedding.dimension), np.nan, dtype=np.float32)
+        if bool(active.any()):
+            out[active.cpu().numpy()] = self._embedding(waveforms[active], masks=masks[active])
+        return out
+
+# Models are loaded once per process and shared by every agent (batch runs, the daemon)
+@functools.lru_cache(maxsize=4)
+def _load_vosk(path: str):
+    SetLogLevel(-1)
+    print(f"[INFO] Loading VOSK: {path}", file=sys.stderr)
+    return Model(path)
+
+@functools.lru_cache(maxsize=4)
+def _load_whisper(model_name: str, cpu_threads: int):
+    print(f"[INFO] Loading Whisper '{model_name}' ({WHISPER_DEVICE})...", file=sys.stderr)
+    # CTranslate2 backend: int8 weights on CPU, fp16 on GPU
+    with contextlib.redirect_stdout(sys.stderr):
+        model = WhisperModel(model_name, device=WHISPER_DEVICE,
+                             compute_type="int8" if WHISPER_DEVICE == "cpu" else "float16",
+                             cpu_threads=cpu_threads)
+        return model, BatchedInferencePipeline(model=model)
+
+# Raises on failure: lru_cache only keeps successful loads, so a transient HF/network
+# error is retried by the next agent or request instead of disabling diarization for good
+@functools.lru_cache(maxsize=4)
+def _load_diarization():
+    print("[INFO] Loading pyannote diarization model...", file=sys.stderr)
+    with contextlib.redirect_stdout(sys.stderr):
+        pipeline = Pipeline.from_pretrained(
+            PYANNOTE_MODEL,
+            token=HF_TOKEN
+        )
+    if pipeline is None:
+        raise RuntimeError(f"{PYANNOTE_MODEL} could not be loaded (check HF_TOKEN access)")
+    # GPU when present (fp16 embeddings where pyannote supports it), else this stage's CPU share
+    if torch.cuda.is_available():
+        pipeline.to(torch.device("cuda"))
+        if hasattr(pipeline, "_embedding_precision"):
+            pipeline._embedding_precision = torch.float16
+    else:
+        pipeline.to(torch.device("cpu"))
+        torch.set_num_threads(DIARIZATION_THREADS)
+    if hasattr(pipeline, "_embedding"):
+        pipeline._embedding = _ActiveMaskEmbedding(pipeline._embedding)
+    print("[INFO] Diarization model loaded!", file=sys.stderr)
+    return pipeline
+
 class HybridTranscriptionAgent:
     MIN_WORDS = 3
 
     def __init__(self, vosk_path: str, model_name: str = None):
-        SetLogLevel(-1)
         if not os.path.exists(vosk_path): raise FileNotFoundError(f"VOSK model not found: {vosk_path}")
-        print(f"[INFO] Loading VOSK: {vosk_path}", file=sys.stderr)
-        self.vosk_model, self.sample_rate = Model(vosk_path), 16000
+        self.vosk_model, self.sample_rate = _load_vosk(vosk_path), 16000
         
         # Use config if model_name not provided
         actual_model = model_name or WHISPER_MODEL
+        # Identify each stage's model (and settings) in cache keys
+        self.cache_tags = {'vosk': Path(vosk_path).name,
+                           'whisper': f"{actual_model}-{WHISPER_TASK}-{WHISPER_LANGUAGE or 'auto'}",
+                           'diarization': PYANNOTE_MODEL.rsplit('/', 1)[-1]}
         
-        import contextlib
-        print(f"[INFO] Loading Whisper '{actual_model}' ({WHISPER_DEVICE})...", file=sys.stderr)
-        with contextlib.redirect_stdout(sys.stderr):
-            self.whisper_model = whisper.load_model(actual_model, device=WHISPER_DEVICE)
-
-        # Initialize diarization pipeline
-        self.diarization_pipeline = None
-        if DIARIZATION_AVAILABLE and HF_TOKEN:
+        diarize = DIARIZATION_AVAILABLE and bool(HF_TOKEN)
+        whisper_threads = max(1, CPU_CORES - 1 - (DIARIZATION_THREADS if diarize else 0))
+        self.whisper_model, self.batched_whisper = _load_whisper(actual_model, whisper_threads)
+        self.diarize, self.diarization_pipeline = diarize, None
+        self._ensure_diarization()
+
+    def _ensure_diarization(self):
+        """Load the diarization pipeline if enabled and not loaded yet; a failed load is
+        retried on the next transcription (the --serve daemon keeps one agent for its lifetime)"""
+        if self.diarize and self.diarization_pipeline is None:
             try:
-                import contextlib
-                print("[INFO] Loading pyannote diarization model...", file=sys.stderr)
-                with contextlib.redirect_stdout(sys.stderr):
-                    self.diarization_pipeline = Pipeline.from_pretrained(
-                        "pyannote/speaker-diarization-3.1",
-                        token=HF_TOKEN
-                    )
-                # Use CPU
-                if self.diarization_pipeline:
-                    self.diarization_pipeline.to(torch.device("cpu"))
-                    print("[INFO] Diarization model loaded!", file=sys.stderr)
+                self.diarization_pipeline = _load_diarization()
             except Exception as e:
                 print(f"[WARN] Failed to load diarization model: {e}", file=sys.stderr)
-                self.diarization_pipeline = None
 
-    def _get_diarization(self, audio_path: str) -> List[Dict]:
+    def _cached(self, stage: str, key: str, fn, arg):
+        """Return stage output from the on-disk cache, computing and storing it on a miss"""
+        if not CACHE_DIR or not key:
+            return fn(arg)
+        path = os.path.join(CACHE_DIR, f"{key}_{stage}_{self.cache_tags[stage]}.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                print(f"[INFO] {stage}: cache hit", file=sys.stderr)
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        result = fn(arg)
+        # Don't persist failures (or empty diarization, which is also how it fails)
+        if not result or (isinstance(result, dict) and result.get('error')):
+            return result
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[WARN] Could not write cache {path}: {e}", file=sys.stderr)
+        return result
+
+    def _get_diarization(self, audio: np.ndarray) -> List[Dict]:
         """
-        Run pyannote speaker diarization on audio file.
+        Run pyannote speaker diarization on the decoded float32 audio.
         Returns list of segments: [{speaker_id, start, end}, ...]
         """
         if not self.diarization_pipeline:
@@ -75,8 +182,12 @@ class HybridTranscriptionAgent:
         print("[INFO] Running speaker diarization...", file=sys.stderr)
 
         try:
-            # Run diarization
-            diarization = self.diarization_pipeline(audio_path)
+            # Hand pyannote the in-memory waveform (channel, time); given a path it
+            # re-reads and crops the file for every embedding window
+            waveform = torch.from_numpy(audio).unsqueeze(0)
+            output = self.diarization_pipeline({"waveform": waveform, "sample_rate": self.sample_rate})
+            # pyannote 4 wraps the Annotation in a DiarizeOutput; 3.x returns it directly
+            diarization = getattr(output, 'speaker_diarization', output)
 
             # Convert to our format
             segments = []
@@ -94,7 +205,8 @@ class HybridTranscriptionAgent:
             return segments
 
         except Exception as e:
-            print(f"[WARN] Diarization failed: {e}", file=sys.stderr)
+            print(f"[WARN] Diarization failed: {type(e).__name__}: {e}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
             return []
 
     def _assign_speaker_to_sentences(self, sentences: List[Dict], diarization: List[Dict]) -> List[Dict]:
@@ -122,22 +234,34 @@ class HybridTranscriptionAgent:
 
             return sentences
 
-        for sent in sentences:
+        # Sweep sentences and diarization turns together in start order. Turns that end
+        # before a sentence begins can't match it or any later sentence, so the cursor
+        # only moves forward; bisecting the turn starts bounds the candidates from above.
+        diarization = sorted(diarization, key=lambda seg: seg["start"])
+        starts = [seg["start"] for seg in diarization]
+        span = lambda sent: (min(sent.get("start", 0), sent.get("end", 0)), max(sent.get("start", 0), sent.get("end", 0)))
+        j = 0
+        for sent in sorted(sentences, key=lambda sent: span(sent)[0]):
             sent_start = sent.get("start", 0)
             sent_end = sent.get("end", 0)
             sent_mid = (sent_start + sent_end) / 2
+            lo, hi = span(sent)
 
-            # Find best matching speaker segment (by midpoint overlap)
+            while j < len(diarization) and diarization[j]["end"] < lo:
+                j += 1
+
+            # Find best matching speaker segment (by midpoint overlap); only turns
+            # starting at or before the midpoint can contain it
             best_speaker = "unknown"
-            for seg in diarization:
-                if seg["start"] <= sent_mid <= seg["end"]:
-                    best_speaker = seg["speaker_id"]
+            for k in range(j, bisect.bisect_right(starts, sent_mid, lo=j)):
+                if sent_mid <= diarization[k]["end"]:
+                    best_speaker = diarization[k]["speaker_id"]
                     break
 
             # Fallback: find segment with most overlap
             if best_speaker == "unknown":
                 max_overlap = 0
-                for seg in diarization:
+                for seg in diarization[j:bisect.bisect_right(starts, hi, lo=j)]:
                     overlap_start = max(sent_start, seg["start"])
                     overlap_end = min(sent_end, seg["end"])
                     overlap = max(0, overlap_end - overlap_start)
@@ -149,66 +273,145 @@ class HybridTranscriptionAgent:
 
         return sentences
 
-    def _convert_wav(self, path: str) -> Optional[str]:
-        tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False); tmp.close()
+    def _decode_audio(self, path: str) -> Optional[np.ndarray]:
+        """Decode any input to 16 kHz mono int16 PCM via ffmpeg's raw s16le stdout.
+        Short audio stays in memory; past MEMMAP_SECONDS it is spilled to disk and memory-mapped."""
+        proc = None
         try:
-            r = subprocess.run(['ffmpeg','-y','-i',path,'-ar','16000','-ac','1','-c:a','pcm_s16le','-f','wav',tmp.name], 
-                              capture_output=True, timeout=120)
-            if r.returncode != 0: os.unlink(tmp.name); return None
-            return tmp.name
-        except: 
-            if os.path.exists(tmp.name): os.unlink(tmp.name)
+            proc = subprocess.Popen(['ffmpeg','-nostdin','-i',path,'-ar','16000','-ac','1','-f','s16le','-'],
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            limit = int(MEMMAP_SECONDS * self.sample_rate) * 2
+            buf, spill, size = bytearray(), None, 0
+            for block in iter(lambda: proc.stdout.read(1 << 20), b''):
+                size += len(block)
+                if spill is None and size > limit:
+                    spill = tempfile.TemporaryFile()
+                    spill.write(buf); buf = None
+                if spill is None: buf += block
+                else: spill.write(block)
+            if proc.wait(timeout=120) != 0: return None
+            if spill is None:
+                return np.frombuffer(buf, dtype=np.int16)
+            spill.flush()
+            return np.memmap(spill, dtype=np.int16, mode='r', shape=(size // 2,))
+        except:
+            if proc and proc.poll() is None: proc.kill()
             return None
 
-    def _vosk(self, wav: str) -> Dict:
+    def _vosk(self, pcm: np.ndarray) -> Dict:
         print("[INFO] VOSK transcription...", file=sys.stderr)
-        with wave.open(wav, 'rb') as wf:
-            rec = KaldiRecognizer(self.vosk_model, wf.getframerate()); rec.SetWords(True)
-            results = []
-            while (data := wf.readframes(4000)):
-                if rec.AcceptWaveform(data):
-                    r = json.loads(rec.Result())
-                    if 'result' in r: results.extend(r['result'])
-            final = json.loads(rec.FinalResult())
-            if 'result' in final: results.extend(final['result'])
+        rec = KaldiRecognizer(self.vosk_model, self.sample_rate); rec.SetWords(True)
+        results = []
+        for i in range(0, len(pcm), VOSK_CHUNK_SAMPLES):
+            if rec.AcceptWaveform(pcm[i:i + VOSK_CHUNK_SAMPLES].tobytes()):
+                r = json.loads(rec.Result())
+                if 'result' in r: results.extend(r['result'])
+        final = json.loads(rec.FinalResult())
+        if 'result' in final: results.extend(final['result'])
         return {'words': results, 'word_count': len(results)}
 
-    def _whisper(self, wav: str) -> Dict:
+    def _split_on_silence(self, audio: np.ndarray, min_silence: float = 0.5,
+                          max_chunk: float = 30.0) -> List[Tuple[int, int]]:
+        """
+        Cut audio at the middle of silent stretches into chunks of at most max_chunk seconds.
+        Returns [(start_sample, end_sample), ...]; stretches with no silence are cut hard at max_chunk.
+        """
+        sr, frame = self.sample_rate, self.sample_rate * 30 // 1000
+        max_len, n = int(max_chunk * sr), len(audio) // frame
+        if len(audio) <= max_len or n == 0:
+            return [(0, len(audio))]
+
+        # 30 ms frames more than 40 dB below the loudest frame count as silence
+        rms = np.sqrt(np.mean(np.square(audio[:n * frame].reshape(n, frame)), axis=1))
+        silent = rms < rms.max() * 0.01
+        runs = np.flatnonzero(np.diff(np.r_[0, silent.astype(np.int8), 0])).reshape(-1, 2)
+        runs = runs[runs[:, 1] - runs[:, 0] >= int(min_silence * 1000) // 30]
+        cuts = [int(c) * frame for c in (runs[:, 0] + runs[:, 1]) // 2 if 0 < c * frame < len(audio)]
+
+        # The end of the audio is a final "cut" so the tail is closed at its last silence
+        # like any other chunk; only stretches without silence are cut hard below
+        chunks, start, last = [], 0, None
+        for c in cuts + [len(audio)]:
+            if c - start > max_len and last is not None:
+                chunks.append((start, last)); start = last
+            last = c
+        chunks.append((start, len(audio)))
+        return [(p, min(p + max_len, b)) for a, b in chunks for p in range(a, b, max_len)]
+
+    def _whisper(self, audio: np.ndarray) -> Dict:
         print("[INFO] Whisper transcription...", file=sys.stderr)
-        import contextlib
         try:
-            import numpy as np
-            with wave.open(wav, 'rb') as wf:
-                audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
-            
-            # Suppress Whisper's "Detected language" print to STDOUT
+            # Silence-delimited chunks go through Whisper in batches; returned
+            # segment times are already absolute within the full recording
+            clips = [{'start': a, 'end': b} for a, b in self._split_on_silence(audio)]
+            # Keep any library output off STDOUT (reserved for the JSON result)
             with contextlib.redirect_stdout(sys.stderr):
-                result = self.whisper_model.transcribe(
-                    audio, 
-                    fp16=False, 
-                    verbose=False,
-                    task=WHISPER_TASK
+                segments, info = self.batched_whisper.transcribe(
+                    audio,
+                    language=WHISPER_LANGUAGE,
+                    task=WHISPER_TASK,
+                    beam_size=1,
+                    batch_size=WHISPER_BATCH_SIZE,
+                    clip_timestamps=clips,
+                    without_timestamps=False  # keep sentence-level segments inside each chunk
                 )
-            
-            return {'text': result['text'].strip(), 'language': result.get('language','unknown'), 'segments': result.get('segments',[])}
+                # segments is a lazy generator; decoding happens here
+                segments = [{'start': s.start, 'end': s.end, 'text': s.text} for s in segments]
+
+            text = ''.join(s['text'] for s in segments).strip()
+            return {'text': text, 'language': info.language or 'unknown', 'segments': segments}
         except Exception as e:
             return {'text': '', 'language': 'en', 'segments': [], 'error': str(e)}
 
+    @staticmethod
+    def _word_stats(words: List[Dict], segs: List[Dict]) -> List[Tuple[int, float, int, float, int]]:
+        """
+        Per segment, over the VOSK words lying fully inside it:
+        (word_count, mean_conf, pause_count, pause_duration, filler_count).
+        """
+        w_start = np.array([w.get('start',0) for w in words], dtype=float)
+        w_end = np.array([w.get('end',0) for w in words], dtype=float)
+        w_conf = np.array([w.get('conf',0) for w in words], dtype=float)
+        # Lower-case filler lookup done once per word, not once per word per segment;
+        # w_bigram[i] marks a two-word filler starting at word i
+        tokens = [w.get('word','').lower() for w in words]
+        w_filler = np.array([t in UNIGRAM_FILLERS for t in tokens], dtype=bool)
+        w_bigram = np.array([p in BIGRAM_FILLERS for p in zip(tokens, tokens[1:])] + [False], dtype=bool)[:len(tokens)]
+        s_arr = np.array([seg.get('start',0) for seg in segs], dtype=float)
+        e_arr = np.array([seg.get('end',0) for seg in segs], dtype=float)
+
+        if np.all(np.diff(w_start) >= 0) and np.all(np.diff(w_end) >= 0):
+            # VOSK emits words in time order, so each segment's words are one contiguous run
+            lo = np.searchsorted(w_start, s_arr, side='left')
+            hi = np.maximum(np.searchsorted(w_end, e_arr, side='right'), lo)
+            buckets = (slice(l, h) for l, h in zip(lo, hi))  # views, no per-segment copies
+        else:
+            buckets = (np.flatnonzero((w_start >= s) & (w_end <= e)) for s, e in zip(s_arr, e_arr))
+
+        def bigrams(ix) -> int:
+            # Both words of the pair must fall in the segment
+            if isinstance(ix, slice):
+                return int(w_bigram[ix.start:max(ix.start, ix.stop - 1)].sum())
+            first = ix[:-1]
+            return int((w_bigram[first] & (ix[1:] == first + 1)).sum())
+
+        stats = []
+        for ix in buckets:
+            starts, ends = w_start[ix], w_end[ix]
+            wc = len(starts)
+            gaps = starts[1:] - ends[:-1]
+            gaps = gaps[gaps > 0.1]
+            stats.append((wc, float(w_conf[ix].sum()) / wc if wc else 0, len(gaps),
+                          float(gaps.sum()) if len(gaps) else 0, int(w_filler[ix].sum()) + bigrams(ix)))
+        return stats
+
     def _combine(self, vosk: Dict, whisper: Dict, diarization: List[Dict] = None) -> Dict:
         words, segs, sents = vosk.get('words',[]), whisper.get('segments',[]), []
 
-        for idx, seg in enumerate(segs):
+        for idx, (seg, (wc, conf, pauses, pause_dur, fillers)) in enumerate(zip(segs, self._word_stats(words, segs))):
             s, e = seg.get('start',0), seg.get('end',0)
-            ws = [w for w in words if w.get('start',0) >= s and w.get('end',0) <= e]
-            wc = len(ws)
-            conf = sum(w.get('conf',0) for w in ws)/wc if ws else 0
-            pauses, pause_dur = 0, 0
-            for i in range(1, len(ws)):
-                gap = ws[i].get('start',0) - ws[i-1].get('end',0)
-                if gap > 0.1: pauses += 1; pause_dur += gap
             dur = e - s
             speed = round((wc/dur)*60, 1) if dur > 0 else 0
-            fillers = sum(1 for w in ws if w.get('word','').lower() in FILLERS)
             sents.append({
                 'sentence_index': idx,  # Stable audit index
                 'text': seg.get('text','').strip(), 
@@ -238,25 +441,31 @@ class HybridTranscriptionAgent:
         if not os.path.exists(path): return err('file_not_found')
         print(f"\n[INFO] Processing: {path}", file=sys.stderr)
 
-        # Step 1: Convert audio first (needed for all steps)
-        wav = self._convert_wav(path)
-        if not wav: return err('audio_preprocessing_failed')
+        # Step 1: Decode audio once, in memory (needed for all steps)
+        pcm = self._decode_audio(path)
+        if pcm is None: return err('audio_preprocessing_failed')
 
-        try:
-            # Step 2: Run diarization, VOSK, Whisper in parallel
-            with ThreadPoolExecutor(max_workers=3) as ex:
-                df = ex.submit(self._get_diarization, wav)
-                vf = ex.submit(self._vosk, wav)
-                wf = ex.submit(self._whisper, wav)
+        # Step 2: VOSK takes the int16 PCM, Whisper and pyannote the float32 copy
+        # (file-backed too when the PCM was spilled)
+        if isinstance(pcm, np.memmap):
+            audio = np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode='w+', shape=pcm.shape)
+        else:
+            audio = np.empty(len(pcm), dtype=np.float32)
+        np.multiply(pcm, np.float32(1 / 32768.0), out=audio, casting='unsafe')
 
-            diarization = df.result()
+        # Step 3: Run diarization, VOSK, Whisper in parallel (re-runs on the same audio hit the cache)
+        self._ensure_diarization()
+        key = hashlib.sha256(pcm).hexdigest()[:16] if CACHE_DIR else None
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            df = ex.submit(self._cached, 'diarization', key if self.diarization_pipeline else None,
+                           self._get_diarization, audio)
+            vf = ex.submit(self._cached, 'vosk', key, self._vosk, pcm)
+            wf = ex.submit(self._cached, 'whisper', key, self._whisper, audio)
 
-            # Step 3: Combine results with diarization
-            return self._combine(vf.result(), wf.result(), diarization)
-        finally:
-            if wav and os.path.exists(wav): 
-                try: os.unlink(wav)
-                except: pass
+        diarization = df.result()
+
+        # Step 4: Combine results with diarization
+        return self._combine(vf.result(), wf.result(), diarization)
 
 def find_model() -> Optional[str]:
     for p in ["vosk-model-en-in-0.5","vosk-model-en-us-0.22","vosk-model-small-en-us-0.15","model",
@@ -265,18 +474,70 @@ def find_model() -> Optional[str]:
         if os.path.isdir(p): return p
     return None
 
+def transcribe_via_daemon(path: str, model_name: str) -> Optional[Dict]:
+    """Have a running `--serve` daemon transcribe path; None if none is listening or it runs another model"""
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(VTOT_SOCKET):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(VTOT_SOCKET)
+            sock.sendall(json.dumps({'audio_path': os.path.abspath(path), 'model': model_name}).encode() + b'\n')
+            with sock.makefile('rb') as f:
+                result = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if result.get('reason') == 'model_mismatch':
+        return None
+    print(f"[INFO] Transcribed by daemon at {VTOT_SOCKET}", file=sys.stderr)
+    return result
+
+def serve(model_name: str):
+    """Load the models once and answer transcription requests on VTOT_SOCKET until killed"""
+    model = find_model()
+    if not model: raise FileNotFoundError("VOSK model not found")
+    agent = HybridTranscriptionAgent(model, model_name)
+    err = lambda r: {'whisper':{'text':'','language':None,'sentence_count':0},'sentences':[],'status':'ERROR','reason':r}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    req = json.loads(line)
+                    if req.get('model', model_name) != model_name: result = err('model_mismatch')
+                    else: result = agent.transcribe(req['audio_path'])
+                except Exception as e:
+                    result = {**err('daemon_error'), 'error': str(e)}
+                self.wfile.write(json.dumps(result).encode() + b'\n')
+
+    if os.path.exists(VTOT_SOCKET): os.unlink(VTOT_SOCKET)
+    # Requests are handled one at a time; the stages inside transcribe() already use every core
+    with socketserver.UnixStreamServer(VTOT_SOCKET, Handler) as server:
+        print(f"[INFO] VtoT daemon ready on {VTOT_SOCKET}", file=sys.stderr)
+        try: server.serve_forever()
+        finally:
+            if os.path.exists(VTOT_SOCKET): os.unlink(VTOT_SOCKET)
+
 def main():
     print(f"[DEBUG] VtoT main started. Args: {sys.argv}", file=sys.stderr)
     err = lambda r: print(json.dumps({'whisper':{'text':'','language':None,'sentence_count':0},'sentences':[],'status':'ERROR','reason':r},indent=2)) or sys.exit(1)
     if len(sys.argv) < 2: 
         print("[DEBUG] No input file provided.", file=sys.stderr)
         err('no_input_file')
+    model_name = sys.argv[2] if len(sys.argv)>=3 else "base"
+    if sys.argv[1] == '--serve':
+        serve(model_name)
+        return
+    # Reuse a warm daemon when one is running; otherwise load the models here
+    result = transcribe_via_daemon(sys.argv[1], model_name)
+    if result is not None:
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result.get('status') in ['SUCCESS','WARNING'] else 1)
     model = find_model()
     print(f"[DEBUG] Found VOSK model: {model}", file=sys.stderr)
     if not model: err('vosk_model_not_found')
     try:
         print("[DEBUG] Initializing HybridTranscriptionAgent...", file=sys.stderr)
-        agent = HybridTranscriptionAgent(model, sys.argv[2] if len(sys.argv)>=3 else "base")
+        agent = HybridTranscriptionAgent(model, model_name)
         print(f"[DEBUG] Transcribing file: {sys.argv[1]}", file=sys.stderr)
         result = agent.transcribe(sys.argv[1])
         print(json.dumps(result, indent=2))
@@ -22,5 +22,8 @@ WHISPER_LANGUAGE = None
 WHISPER_TASK = "transcribe"
 WHISPER_DEVICE = "cpu"
 
+# === Diarization Configuration ===
+PYANNOTE_MODEL = os.environ.get("PYANNOTE_MODEL", "pyannote/speaker-diarization-community-1")
+
 # === Feature Flags ===
 ENABLE_LLM_INTERPRETATION = True
@@ -31,5 +31,9 @@ WHISPER_LANGUAGE = None        # e.g., "hi", "en", "es" (None for auto-detect)
 WHISPER_TASK = "transcribe"    # "transcribe" or "translate"
 WHISPER_DEVICE = "cpu"         # "cpu" or "cuda"
 
+# === Diarization Configuration ===
+# community-1 is far faster on CPU than 3.1; set "pyannote/speaker-diarization-3.1" to revert
+PYANNOTE_MODEL = os.environ.get("PYANNOTE_MODEL", "pyannote/speaker-diarization-community-1")
+
 # === Feature Flags ===
 ENABLE_LLM_INTERPRETATION = True  # Master toggle for LLM features
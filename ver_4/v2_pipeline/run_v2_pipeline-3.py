@@ -2,12 +2,17 @@
 Audio -> VtoT -> Translate -> TextEXT -> Interpret -> FinContext -> EventProcessor
 """
 
-import subprocess
+import importlib.util
 import os
 import sys
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
 SCRIPTS = {
     "vtot": os.path.join(PIPELINE_DIR, "VtoT(3)ver-3.py"),
@@ -15,26 +20,73 @@ SCRIPTS = {
     "textext": os.path.join(PIPELINE_DIR, "TextEXTver-3.py"),
     "interpret": os.path.join(PIPELINE_DIR, "Interpretver-3.py"),
     "fincontext": os.path.join(PIPELINE_DIR, "FinContextver-3.py"),
-    "processor": os.path.join(PIPELINE_DIR, "EventProcessor-3.py")
+    "processor": os.path.join(PIPELINE_DIR, "EventProcessor-3.py"),
+    # Imported by name from Translate and EventProcessor
+    "BackboardClient": os.path.join(PIPELINE_DIR, "BackboardClient-3.py")
 }
 
-def run_command(cmd, input_file=None, output_file=None):
-    cmd_str = f'"{sys.executable}" ' + ' '.join([f'"{c}"' if ' ' in c or '(' in c or ')' in c else c for c in cmd[1:]])
-    print(f"[RUNNING] {cmd_str}")
+# Stages import config (and each other) by plain module name
+if PIPELINE_DIR not in sys.path:
+    sys.path.insert(0, PIPELINE_DIR)
+
+def load_stage(name):
+    """Import a stage script as a module; file names like 'VtoT(3)ver-3.py' aren't importable directly"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS[name])
+    module = importlib.util.module_from_spec(spec)
+    # Register before executing so lookups by module name (e.g. Numba's cache) resolve
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+def save_json(obj, path, pretty=False):
+    """Write obj as JSON: compact for machine-read intermediates, indented if pretty"""
+    if orjson:
+        with open(path, 'wb') as out:
+            out.write(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)))
+    else:
+        with open(path, 'w', encoding='utf-8') as out:
+            json.dump(obj, out, ensure_ascii=False, **({'indent': 2} if pretty else {'separators': (',', ':')}))
+
+def run_stage(label, fn, output_file=None, pretty=False):
+    """Run one stage in-process and optionally save its result as JSON; None on failure"""
+    print(f"[RUNNING] {label}")
     try:
-        env = os.environ.copy()
-        env["PYTHONPATH"] = PIPELINE_DIR
-        if output_file:
-            with open(output_file, 'w') as out:
-                subprocess.run(cmd_str, check=True, stdout=out, stderr=subprocess.PIPE, text=True, shell=True, env=env)
-        else:
-            subprocess.run(cmd_str, check=True, shell=True, env=env)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Step failed: {e}")
-        if e.stderr:
-            print(f"[STDERR] {e.stderr}")
-        return False
+        result = fn()
+    except (Exception, SystemExit) as e:
+        print(f"[ERROR] Step failed: {label}: {e}")
+        return None
+    if output_file:
+        save_json(result, output_file, pretty)
+    return result
+
+def transcribe(audio_path):
+    vtot = load_stage("vtot")
+    # A running `VtoT(3)ver-3.py --serve` daemon already has the models loaded
+    result = vtot.transcribe_via_daemon(audio_path, "base")
+    if result is not None:
+        return result
+    model = vtot.find_model()
+    if not model:
+        raise RuntimeError("vosk_model_not_found")
+    return vtot.HybridTranscriptionAgent(model, "base").transcribe(audio_path)
+
+def translate(vtot_data):
+    load_stage("BackboardClient")
+    # translate_data edits its input in place and Interpret still needs the original.
+    # It only sets keys on the top level, 'whisper' and each sentence, so copying those
+    # dicts is enough; the words, speech metrics etc. underneath are shared, not duplicated
+    data = dict(vtot_data)
+    if isinstance(data.get('whisper'), dict):
+        data['whisper'] = dict(data['whisper'])
+    if isinstance(data.get('sentences'), list):
+        data['sentences'] = [dict(s) for s in data['sentences']]
+    return load_stage("translate").translate_data(data)
 
 def main():
     if len(sys.argv) < 2:
@@ -62,24 +114,39 @@ def main():
 
     print("=== STARTING V2 PIPELINE ===")
     
+    # Every stage runs in this process: models load once and results pass as dicts.
+    # Intermediate JSON files are still written (compact) for the server and for debugging;
+    # the final events file is indented for reading.
+    
     # 1. Transcription (Hybrid + Diarization)
-    if not run_command([sys.executable, SCRIPTS["vtot"], audio_path], output_file=out_vtot): sys.exit(1)
+    vtot = run_stage("vtot", lambda: transcribe(audio_path), out_vtot)
+    if vtot is None: sys.exit(1)
+    if vtot.get('status') not in ['SUCCESS', 'WARNING']:
+        print(f"[ERROR] Step failed: vtot: {vtot.get('reason')}")
+        sys.exit(1)
     
     # 2. Translation
-    if not run_command([sys.executable, SCRIPTS["translate"], out_vtot, out_trans]): sys.exit(1)
+    translated = run_stage("translate", lambda: translate(vtot), out_trans)
+    if translated is None: sys.exit(1)
     
     # 3. Behavioral Interpretation
-    if not run_command([sys.executable, SCRIPTS["interpret"], out_vtot], output_file=out_signals): sys.exit(1)
+    signals = run_stage("interpret", lambda: load_stage("interpret").transform(vtot), out_signals)
+    if signals is None: sys.exit(1)
     
     # 4. Text Extraction
-    if not run_command([sys.executable, SCRIPTS["textext"], out_trans], output_file=out_markers): sys.exit(1)
+    markers = run_stage("textext", lambda: load_stage("textext").transform(translated), out_markers)
+    if markers is None: sys.exit(1)
     
     # 5. Financial Context
-    context_args = [f"product_type={product_type}", f"amount={amount}", f"customer_type={customer_type}"]
-    if not run_command([sys.executable, SCRIPTS["fincontext"]] + context_args, output_file=out_context): sys.exit(1)
+    # amount is parsed inside the stage so a bad value fails it like any other stage error
+    context = run_stage("fincontext", lambda: load_stage("fincontext").inject_context(
+        {"product_type": product_type, "amount": float(amount), "customer_type": customer_type}), out_context)
+    if context is None: sys.exit(1)
     
     # 6. Final Event Processor (Unified Detection + LLM)
-    if not run_command([sys.executable, SCRIPTS["processor"], out_trans, out_signals, out_markers, out_context], output_file=out_final): sys.exit(1)
+    final = run_stage("processor", lambda: load_stage("processor").generate_and_interpret_events(
+        vtot_data=translated, signals=signals, text_markers=markers, financial_context=context), out_final, pretty=True)
+    if final is None: sys.exit(1)
 
     print(f"\n[SUCCESS] Pipeline complete. Results saved to: {out_final}")
 
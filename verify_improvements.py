@@ -2,12 +2,47 @@
 """
 Verification script to test improved VtoT(2) configuration
 Shows differences before/after the improvements
+
+Usage: python verify_improvements.py [audio1.wav audio2.wav ...]
+       (several files are transcribed concurrently)
 """
 import subprocess
 import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+def run_one(audio_file, output_file):
+    """Run VtoT(2) on one audio file and save its JSON output; None if it can't be parsed"""
+    # The child's stdout goes straight into the output file (it already prints indented
+    # JSON), so nothing is held in a pipe; its stderr progress shows live
+    tmp = f"{output_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            subprocess.run(["python", "VtoT(2).py", audio_file], stdout=f, timeout=120)
+        
+        # Parse output
+        try:
+            with open(tmp, 'r', encoding='utf-8') as f:
+                output = json.load(f)
+        except:
+            with open(tmp, 'r', encoding='utf-8', errors='replace') as f:
+                head = f.read(200)
+            print(f"[ERROR] Failed to parse output for {audio_file}")
+            print(f"stdout: {head}")
+            return None
+        
+        # Save output
+        os.replace(tmp, output_file)
+        return output
+    except subprocess.TimeoutExpired:
+        print(f"[ERROR] Transcription timed out for {audio_file}")
+        return None
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
 
-def test_vtot2_improvements():
+def test_vtot2_improvements(audio_files=None):
     """Test VtoT(2) with improvements"""
     
     print("=" * 80)
@@ -15,44 +50,51 @@ def test_vtot2_improvements():
     print("=" * 80)
     print()
     
-    # Test audio file
-    audio_file = r"C:\Users\arnav\Downloads\Sales Call example 1.wav"
-    output_file = "sales_call_improved_output.json"
-    
-    if not os.path.exists(audio_file):
-        print("[WARNING] Sales call audio not found. Using sample audio...")
-        audio_file = "sample_audio_v2.wav"
+    if audio_files:
+        cases = []
+        for f in audio_files:
+            # Same-named files from different folders get a numeric suffix instead of
+            # writing to one output (and temp) file
+            base = os.path.splitext(os.path.basename(f))[0]
+            output_file, n = f"{base}_improved_output.json", 1
+            while output_file in (c[1] for c in cases):
+                n += 1
+                output_file = f"{base}_{n}_improved_output.json"
+            cases.append((f, output_file))
+    else:
+        # Test audio file
+        audio_file = r"C:\Users\arnav\Downloads\Sales Call example 1.wav"
+        
+        if not os.path.exists(audio_file):
+            print("[WARNING] Sales call audio not found. Using sample audio...")
+            audio_file = "sample_audio_v2.wav"
+        cases = [(audio_file, "sales_call_improved_output.json")]
     
-    print(f"[INFO] Testing with: {audio_file}")
+    for audio_file, _ in cases:
+        print(f"[INFO] Testing with: {audio_file}")
     print()
     
-    # Run VtoT(2) with improvements
+    # Run VtoT(2) with improvements. Each run is its own process loading its own
+    # VOSK model, so at most half the cores run at once to leave memory headroom
     print("[1/2] RUNNING IMPROVED VTOT(2)")
     print("-" * 80)
     
-    result = subprocess.run(
-        ["python", "VtoT(2).py", audio_file],
-        capture_output=True,
-        text=True,
-        timeout=120
-    )
+    workers = max(1, min(len(cases), (os.cpu_count() or 2) // 2))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        outputs = list(ex.map(lambda case: run_one(*case), cases))
     
-    # Parse output
-    try:
-        output = json.loads(result.stdout)
-    except:
-        print(f"[ERROR] Failed to parse output")
-        print(f"stdout: {result.stdout[:200]}")
-        print(f"stderr: {result.stderr[:200]}")
-        return
-    
-    # Save output
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2)
-    
-    print(f"[OK] Transcription complete")
-    print()
+    for (audio_file, output_file), output in zip(cases, outputs):
+        if output is not None:
+            print(f"[OK] Transcription complete: {audio_file}")
+            print()
+            report(output)
     
+    saved = [output_file for (_, output_file), output in zip(cases, outputs) if output is not None]
+    if saved:
+        summary(saved)
+
+def report(output):
+    """Print the analysis of one VtoT(2) result"""
     # Display results
     print("[2/2] RESULTS ANALYSIS")
     print("-" * 80)
@@ -90,7 +132,9 @@ def test_vtot2_improvements():
         print()
         print("  This audio was rejected due to quality issues.")
         print("  With larger models, rejection rate should decrease.")
-    
+
+def summary(output_files):
+    """Print the list of improvements and where the outputs went"""
     print()
     print("=" * 80)
     print("IMPROVEMENTS SUMMARY")
@@ -102,7 +146,8 @@ def test_vtot2_improvements():
     print("✓ Low confidence ratio: 60% (down from 70%)")
     print("✓ Model preference: en-in-0.5 > en-us-0.22 > small-en-us-0.15")
     print()
-    print(f"Output saved to: {output_file}")
+    for output_file in output_files:
+        print(f"Output saved to: {output_file}")
     print()
     print("NEXT STEPS:")
     print("  1. Download larger model: python download_large_models.py")
@@ -110,4 +155,4 @@ def test_vtot2_improvements():
     print()
 
 if __name__ == "__main__":
-    test_vtot2_improvements()
+    test_vtot2_improvements(sys.argv[1:])